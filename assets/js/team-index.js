@@ -0,0 +1,87 @@
+/*
+ * Team index lazy loading
+ *
+ * index.html only renders the first page of team members. The rest is
+ * published as compact JSON chunks ([first_name, last_name, title, filename]
+ * per member) that are fetched as the visitor scrolls towards the end of the
+ * grid.
+ */
+(function () {
+  var grid = document.getElementById('team-grid');
+  var sentinel = document.getElementById('team-grid-sentinel');
+  if (!grid || !sentinel || !('fetch' in window)) {
+    return;
+  }
+
+  var chunkUrl = grid.getAttribute('data-chunk-url');
+  var chunkCount = parseInt(grid.getAttribute('data-chunk-count'), 10) || 0;
+  var nextChunk = 1;
+  var loading = false;
+
+  function memberCard(member) {
+    var card = document.createElement('div');
+    card.className = 'member-card';
+
+    var name = document.createElement('h3');
+    name.textContent = member[0] + ' ' + member[1];
+
+    var title = document.createElement('p');
+    title.textContent = member[2];
+
+    var link = document.createElement('a');
+    link.className = 'view-button';
+    link.href = 'html/' + encodeURIComponent(member[3]) + '.html';
+    link.textContent = 'View Contact Card';
+
+    card.appendChild(name);
+    card.appendChild(title);
+    card.appendChild(link);
+    return card;
+  }
+
+  function sentinelVisible() {
+    return sentinel.getBoundingClientRect().top < window.innerHeight + 600;
+  }
+
+  function loadNextChunk() {
+    if (loading || nextChunk > chunkCount) {
+      return;
+    }
+    loading = true;
+
+    fetch(chunkUrl.replace('{n}', nextChunk))
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error('HTTP ' + response.status);
+        }
+        return response.json();
+      })
+      .then(function (members) {
+        var fragment = document.createDocumentFragment();
+        members.forEach(function (member) {
+          fragment.appendChild(memberCard(member));
+        });
+        grid.appendChild(fragment);
+        nextChunk += 1;
+        loading = false;
+
+        if (nextChunk > chunkCount) {
+          observer.disconnect();
+          sentinel.remove();
+        } else if (sentinelVisible()) {
+          // Still at the bottom of a short page: keep filling it
+          loadNextChunk();
+        }
+      })
+      .catch(function () {
+        loading = false;
+      });
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting) {
+      loadNextChunk();
+    }
+  }, { rootMargin: '600px 0px' });
+  observer.observe(sentinel);
+})();
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: card server response times, rendered vs cached vs 304
+
+Creates a synthetic project (see synthetic_roster.py) in a temporary
+directory, starts the card server app on it and requests every contact
+card, vCard and index chunk three times through Flask's test client: with
+an empty render cache, with everything cached, and as conditional requests
+with the ETag of the first response (304). No sockets are opened, so the
+numbers are the app's own cost per request.
+
+Usage:
+    python benchmarks/bench_card_server.py [--rows 2000]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from card_server import create_app, flask_available, server_settings  # noqa: E402
+from synthetic_roster import make_project  # noqa: E402
+
+
+def timed_requests(client, urls, etags=None):
+    """Request every URL; return (seconds, status counts, ETags)."""
+    statuses = {}
+    new_etags = []
+    start = time.perf_counter()
+    for i, url in enumerate(urls):
+        headers = {'If-None-Match': etags[i]} if etags else {}
+        response = client.get(url, headers=headers)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        new_etags.append(response.headers.get('ETag'))
+    return time.perf_counter() - start, statuses, new_etags
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the card server's render cache and 304s.")
+    parser.add_argument('--rows', type=int, default=2000)
+    args = parser.parse_args(argv)
+    if not flask_available():
+        print("❌ Error: Flask is not installed (pip install flask)")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        make_project(project, args.rows)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            app = create_app(project, dict(server_settings({}), cache_size=args.rows * 3))
+        site = app.extensions['card_site']
+        client = app.test_client()
+
+        roster = site.roster
+        urls = ['/']
+        urls += [f"/members/page-{n}.json" for n in range(1, site.chunk_count(roster) + 1)]
+        urls += [f"/html/{member.filename}.html" for member in roster.members]
+        urls += [f"/vcf/{member.filename}.vcf" for member in roster.members]
+
+        print(f"📊 Card server: {len(roster.members)} members, {len(urls)} URLs")
+        cold, statuses, etags = timed_requests(client, urls)
+        print(f"   rendered  {cold / len(urls) * 1e6:8.0f} µs/request  {statuses}")
+        warm, statuses, _ = timed_requests(client, urls)
+        print(f"   cached    {warm / len(urls) * 1e6:8.0f} µs/request  {statuses}")
+        conditional, statuses, _ = timed_requests(client, urls, etags)
+        print(f"   304       {conditional / len(urls) * 1e6:8.0f} µs/request  {statuses}")
+        print(f"   cache: {len(site.cache)} entries, {site.cache.hits} hits, {site.cache.misses} misses")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: transferred bytes per contact card with and without minification
+
+Renders the contact card of every member in team_data.csv (nothing is
+written to output/) and reports the average page size before and after HTML
+minification, both raw and gzip-compressed (what a browser would download
+from a compressing host). The stylesheet is measured the same way.
+
+Usage:
+    python benchmarks/bench_minify.py
+"""
+
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate_site import ContactCardSiteGenerator  # noqa: E402
+from minify import minify_css, minify_html  # noqa: E402
+
+
+def sizes(text):
+    """Return (raw bytes, gzip bytes) of a text."""
+    data = text.encode('utf-8')
+    return len(data), len(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def main():
+    generator = ContactCardSiteGenerator()
+    template = generator.get_template('contact-card.html')
+    members = list(generator.iter_prepared_members(generator.iter_csv_data()))
+
+    totals = {'plain': [0, 0], 'minified': [0, 0]}
+    minify_seconds = 0.0
+    for member in members:
+        html = template.render(member=member, config=generator.config)
+        start = time.perf_counter()
+        minified = minify_html(html)
+        minify_seconds += time.perf_counter() - start
+        for key, text in (('plain', html), ('minified', minified)):
+            raw, compressed = sizes(text)
+            totals[key][0] += raw
+            totals[key][1] += compressed
+
+    count = max(len(members), 1)
+    print(f"📊 Contact cards: {len(members)} members")
+    for key in ('plain', 'minified'):
+        raw, compressed = totals[key]
+        print(f"   {key:<9} {raw / count:8.0f} bytes/card raw  {compressed / count:8.0f} bytes/card gzip")
+    print(f"   minify time: {minify_seconds / count * 1e6:.0f} µs/card")
+
+    css = (generator.assets_dir / "css" / "style.css").read_text(encoding='utf-8')
+    print("📊 style.css")
+    for key, text in (('plain', css), ('minified', minify_css(css))):
+        raw, compressed = sizes(text)
+        print(f"   {key:<9} {raw:8d} bytes raw       {compressed:8d} bytes gzip")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
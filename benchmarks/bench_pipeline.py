@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: per-stage timings of the site and wallet pipelines
+
+For every roster size (and with and without avatars) a synthetic project is
+created in a temporary directory (see synthetic_roster.py) and each stage
+of a build is timed on its own, wall clock and CPU:
+
+    asset_copy, avatar_variants, csv_read, validate, prepare, html_render,
+    vcf_write, index_render, pass_build_sign
+
+Passes are built and signed for the first ``--passes`` members only, with
+a throwaway certificate chain created by ``openssl`` for the run; the
+per-pass time is what to compare.
+
+Results are printed as a table and written as JSON (``--json``). Passing
+an earlier result file with ``--compare`` prints the change per stage, so
+regressions show up between commits.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--rows 10 1000 100000] [--no-avatars]
+        [--passes 10] [--pass-jobs 1] [--json bench-results.json] [--compare old.json]
+
+    A 1,000,000-row run (--rows 1000000) writes about two million files
+    and needs several GB of free space in the temp directory.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import jinja2  # noqa: E402
+from generate_site import ContactCardSiteGenerator  # noqa: E402
+from synthetic_roster import make_project  # noqa: E402
+
+STAGES = ('asset_copy', 'avatar_variants', 'csv_read', 'validate', 'prepare',
+          'html_render', 'vcf_write', 'index_render', 'pass_build_sign')
+
+CERT_PASSWORD = "bench"
+
+
+def timed(function, *args):
+    """Run function(*args) quietly; return (result, wall seconds, CPU seconds)."""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = function(*args)
+    return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def make_signing_certs(target_dir):
+    """Create a throwaway CA ("WWDR") and a pass certificate signed by it.
+
+    Returns ``(p12_path, wwdr_path)``, or None when openssl is missing.
+    """
+    if shutil.which("openssl") is None:
+        return None
+    target_dir = Path(target_dir)
+    commands = [
+        ['req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-keyout', 'wwdr.key', '-out', 'wwdr.pem', '-subj', '/CN=Benchmark WWDR'],
+        ['req', '-newkey', 'rsa:2048', '-nodes', '-keyout', 'pass.key', '-out', 'pass.csr',
+         '-subj', '/UID=pass.com.scalewave.contacts.team/CN=Benchmark Pass'],
+        ['x509', '-req', '-days', '1', '-in', 'pass.csr', '-CA', 'wwdr.pem',
+         '-CAkey', 'wwdr.key', '-CAcreateserial', '-out', 'pass.pem'],
+        ['pkcs12', '-export', '-in', 'pass.pem', '-inkey', 'pass.key',
+         '-out', 'pass.p12', '-passout', f'pass:{CERT_PASSWORD}'],
+    ]
+    for command in commands:
+        subprocess.run(['openssl'] + command, cwd=target_dir, check=True, capture_output=True)
+    return target_dir / "pass.p12", target_dir / "wwdr.pem"
+
+
+def build_passes(generator, members, certs, jobs=1):
+    """Build and sign one pass per prepared member with the wallet API."""
+    from wallet_passes import WalletPasses, wallet_settings
+
+    p12_path, wwdr_path = certs
+    settings = dict(wallet_settings(generator.config), certificate=str(p12_path),
+                    certificate_password=CERT_PASSWORD, wwdr_certificate=str(wwdr_path))
+    wallet_passes = WalletPasses(generator.base_dir, generator.signed_passes_dir, settings, force=True,
+                                 jobs=jobs)
+    for member in members:
+        wallet_passes.add(member)
+    report = wallet_passes.close()
+    return report['built']
+
+
+def run_pipeline(project_dir, passes, certs, pass_jobs=1):
+    """Time every stage on one project; returns {stage: measurements}."""
+    generator = ContactCardSiteGenerator(project_dir)
+    stages = {}
+
+    def record(name, items, wall, cpu):
+        stages[name] = {'wall': wall, 'cpu': cpu, 'items': items}
+
+    _, wall, cpu = timed(generator.copy_assets_to_output)
+    record('asset_copy', sum(1 for path in generator.assets_dir.rglob('*') if path.is_file()), wall, cpu)
+
+    _, wall, cpu = timed(generator.build_avatar_index)
+    avatar_count = len(generator._avatar_index)
+    _, wall2, cpu2 = timed(generator.generate_avatar_derivatives)
+    record('avatar_variants', avatar_count, wall + wall2, cpu + cpu2)
+
+    rows, wall, cpu = timed(lambda: list(generator.iter_csv_data()))
+    record('csv_read', len(rows), wall, cpu)
+
+    valid, wall, cpu = timed(lambda: [row for row_num, row in enumerate(rows, start=2)
+                                      if generator.validate_member_data(row, row_num)])
+    record('validate', len(rows), wall, cpu)
+
+    members, wall, cpu = timed(lambda: [generator.prepare_member_data(row) for row in valid])
+    record('prepare', len(members), wall, cpu)
+
+    _, wall, cpu = timed(lambda: [generator.generate_contact_card(member) for member in members])
+    record('html_render', len(members), wall, cpu)
+
+    _, wall, cpu = timed(lambda: [generator.generate_vcf_file(member) for member in members])
+    record('vcf_write', len(members), wall, cpu)
+
+    _, wall, cpu = timed(generator.generate_index_page, [member.summary() for member in members])
+    record('index_render', len(members), wall, cpu)
+
+    if certs and passes:
+        sample = members[:passes]
+        built, wall, cpu = timed(build_passes, generator, sample, certs, pass_jobs)
+        record('pass_build_sign', len(sample), wall, cpu)
+        stages['pass_build_sign']['succeeded'] = built
+
+    for measurement in stages.values():
+        measurement['per_item_us'] = (measurement['wall'] / measurement['items'] * 1e6
+                                      if measurement['items'] else None)
+    return stages
+
+
+def git_commit():
+    """Current commit of the repository, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_key(run):
+    return (run['rows'], run['avatars'])
+
+
+def print_run(run, baseline=None):
+    """Print the stages of one run, with the change against a baseline run."""
+    label = f"{run['rows']:,} rows, {'with' if run['avatars'] else 'no'} avatars"
+    print(f"\n📊 {label}")
+    print(f"   {'stage':<16} {'wall':>9} {'cpu':>9} {'items':>9} {'µs/item':>10}"
+          + (f" {'vs base':>9}" if baseline else ""))
+    for name in STAGES:
+        stage = run['stages'].get(name)
+        if stage is None:
+            print(f"   {name:<16} {'skipped':>9}")
+            continue
+        per_item = f"{stage['per_item_us']:.1f}" if stage['per_item_us'] is not None else "-"
+        line = (f"   {name:<16} {stage['wall']:>8.3f}s {stage['cpu']:>8.3f}s "
+                f"{stage['items']:>9,} {per_item:>10}")
+        base_stage = (baseline or {}).get('stages', {}).get(name)
+        if base_stage and base_stage['wall'] > 0:
+            line += f" {(stage['wall'] / base_stage['wall'] - 1) * 100:>+8.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10, 1000, 100_000])
+    parser.add_argument('--no-avatars', action='store_true',
+                        help="only run rosters without avatars")
+    parser.add_argument('--avatar-ratio', type=float, default=0.25,
+                        help="share of members with an avatar in the avatar runs")
+    parser.add_argument('--passes', type=int, default=10,
+                        help="passes to build and sign per run (0 to skip)")
+    parser.add_argument('--pass-jobs', type=int, default=1,
+                        help="worker processes for building passes")
+    parser.add_argument('--json', default='bench-results.json',
+                        help="where to write the JSON results")
+    parser.add_argument('--compare', help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baselines = {run_key(run): run for run in json.load(f)['runs']}
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'jinja2': jinja2.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'runs': [],
+    }
+
+    avatar_modes = [False] if args.no_avatars else [False, True]
+    with tempfile.TemporaryDirectory() as tmp:
+        certs = make_signing_certs(Path(tmp)) if args.passes else None
+        if args.passes and certs is None:
+            print("⚠️  openssl not found: skipping pass_build_sign")
+
+        for rows in args.rows:
+            for avatars in avatar_modes:
+                project_dir = Path(tmp) / f"project-{rows}-{int(avatars)}"
+                avatar_count = make_project(project_dir, rows, args.avatar_ratio if avatars else 0)
+                run = {
+                    'rows': rows,
+                    'avatars': avatars,
+                    'avatar_files': avatar_count,
+                    'stages': run_pipeline(project_dir, args.passes, certs, args.pass_jobs),
+                }
+                results['runs'].append(run)
+                print_run(run, baselines.get(run_key(run)))
+                shutil.rmtree(project_dir)
+
+    with open(args.json, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: PreparedMember records vs the old per-stage dict preparation
+
+Before PreparedMember, every row was prepared up to four times (contact card,
+VCF, avatar status and index page), each time copying the row dict and
+re-running the regex and avatar work. This benchmark replays that pattern
+against preparing each row once into a ``__slots__`` record.
+
+Usage:
+    python benchmarks/bench_prepare_member.py [--rows 100000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate_site import ContactCardSiteGenerator  # noqa: E402
+
+
+def make_rows(count):
+    """Build synthetic, already validated CSV rows."""
+    return [
+        {
+            'first_name': f"Member {i}",
+            'last_name': f"Surname-{i}",
+            'title': "Software Engineer",
+            'company_name': "ScaleWave",
+            'phone': f"+1 (555) {i % 1000:03d}-{i % 10000:04d}",
+            'email': f"member{i}@example.com",
+            'linkedin_url': f"https://www.linkedin.com/in/member-{i}/",
+            'twitter_handle': f"member{i}",
+            'avatar_url': "",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_prepare_member_data(generator, member_data):
+    """The dict-copy preparation used before PreparedMember."""
+    prepared = member_data.copy()
+    prepared['filename'] = generator.clean_filename(
+        member_data['first_name'], member_data['last_name']
+    )
+    prepared['phone_formatted'] = generator.format_phone(member_data['phone'])
+    prepared['phone_clean'] = generator.get_phone_clean(member_data['phone'])
+    prepared['avatar_path'] = generator.check_avatar_exists(
+        member_data['first_name'], member_data['last_name']
+    )
+    twitter = member_data.get('twitter_handle', '').strip()
+    if twitter and not twitter.startswith('@'):
+        prepared['twitter_handle'] = f"@{twitter}"
+    return prepared
+
+
+def run_legacy(generator, rows):
+    """Prepare rows the way the four output stages used to."""
+    index_members = []
+    for row in rows:
+        legacy_prepare_member_data(generator, row)  # contact card
+        legacy_prepare_member_data(generator, row)  # VCF
+        legacy_prepare_member_data(generator, row)  # avatar status
+    for row in rows:
+        index_members.append(legacy_prepare_member_data(generator, row))  # index
+    return index_members
+
+
+def run_prepared(generator, rows):
+    """Prepare every row once and share the record."""
+    return [generator.prepare_member_data(row) for row in rows]
+
+
+def measure(func, generator, rows):
+    """Return (seconds, peak bytes) of func.
+
+    Timing and memory are measured in separate runs because tracemalloc
+    slows allocation-heavy code down considerably.
+    """
+    start = time.perf_counter()
+    func(generator, rows)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = func(generator, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    generator = ContactCardSiteGenerator()
+    rows = make_rows(args.rows)
+
+    print(f"📊 Preparing {args.rows:,} synthetic members")
+    legacy_time, legacy_peak = measure(run_legacy, generator, rows)
+    prepared_time, prepared_peak = measure(run_prepared, generator, rows)
+
+    print(f"   Legacy dicts (4x per row): {legacy_time:8.3f}s  peak {legacy_peak / 2**20:8.1f} MiB")
+    print(f"   PreparedMember (1x):       {prepared_time:8.3f}s  peak {prepared_peak / 2**20:8.1f} MiB")
+    print(f"⚡ Speed-up: {legacy_time / prepared_time:.1f}x, "
+          f"memory: {legacy_peak / max(prepared_peak, 1):.1f}x less")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
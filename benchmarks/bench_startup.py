@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start time of the site generator
+
+Starts a fresh Python process per run that imports scripts/generate_site.py,
+creates the generator and loads every site template, i.e. everything the
+main process and each render worker do before the first card. Three
+template setups are compared in a throwaway project copy:
+
+- ``no cache``: templates parsed and compiled from source on every start
+  (what every start did before the bytecode cache)
+- ``bytecode``: compiled code read from the warm on-disk bytecode cache
+- ``precompiled``: modules written by ``--compile-templates`` imported
+
+The import of generate_site.py itself is timed separately.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 20]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    'no cache': {'bytecode_cache': False, 'precompiled': False},
+    'bytecode': {'bytecode_cache': True, 'precompiled': False},
+    'precompiled': {'bytecode_cache': False, 'precompiled': True},
+}
+
+
+def make_project(target_dir):
+    """Copy the files the generator needs to start into target_dir."""
+    target_dir = Path(target_dir)
+    shutil.copy2(REPO_DIR / "config.json", target_dir / "config.json")
+    shutil.copytree(REPO_DIR / "templates", target_dir / "templates")
+    shutil.copytree(REPO_DIR / "scripts", target_dir / "scripts",
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    return target_dir
+
+
+def set_template_config(project_dir, template_config):
+    """Rewrite the templates section of the project config."""
+    config_file = Path(project_dir) / "config.json"
+    config = json.loads(config_file.read_text(encoding='utf-8'))
+    config['templates'] = template_config
+    config_file.write_text(json.dumps(config, indent=2), encoding='utf-8')
+
+
+def run_child(project_dir):
+    """Start the generator in this (fresh) process and print JSON timings."""
+    start = time.perf_counter()
+    sys.path.insert(0, str(Path(project_dir) / "scripts"))
+    import generate_site
+    imported = time.perf_counter()
+
+    generator = generate_site.ContactCardSiteGenerator(project_dir)
+    for name in generate_site.SITE_TEMPLATES:
+        generator.get_template(name)
+    loaded = time.perf_counter()
+
+    print(json.dumps({
+        'import': imported - start,
+        'templates': loaded - imported,
+        'total': loaded - start,
+        'precompiled': generator.precompiled_templates_used,
+    }))
+
+
+def measure(project_dir, runs):
+    """Median timings of ``runs`` fresh processes."""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', str(project_dir)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output))
+    timings = {key: statistics.median(result[key] for result in results)
+               for key in ('import', 'templates', 'total')}
+    timings['precompiled'] = results[-1]['precompiled']
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = make_project(tmp)
+        # Warm the Python bytecode of the scripts so only templates differ
+        subprocess.run([sys.executable, '-m', 'compileall', '-q', str(project_dir / "scripts")],
+                       check=True)
+
+        print(f"Median of {args.runs} fresh processes")
+        print(f"{'templates':>12}  {'import':>9}  {'templates':>10}  {'total':>9}")
+        for mode, template_config in MODES.items():
+            set_template_config(project_dir, template_config)
+            if template_config['precompiled']:
+                subprocess.run([sys.executable, str(project_dir / "scripts" / "generate_site.py"),
+                                '--compile-templates'], cwd=project_dir, check=True,
+                               capture_output=True)
+            elif template_config['bytecode_cache']:
+                # One start to fill the cache
+                measure(project_dir, 1)
+            timings = measure(project_dir, args.runs)
+            if template_config['precompiled'] and not timings['precompiled']:
+                print(f"{mode:>12}  precompiled modules were not picked up")
+                continue
+            print(f"{mode:>12}  {timings['import'] * 1000:>6.1f} ms  "
+                  f"{timings['templates'] * 1000:>7.1f} ms  {timings['total'] * 1000:>6.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
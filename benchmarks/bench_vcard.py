@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vCard serializer throughput
+
+Compares the shared serializer in scripts/vcard.py with the two builders it
+replaced (the site generator's unescaped, unfolded ``_build_vcf_content``
+and the wallet script's ``build_vcard``, copied below as they were) on a
+synthetic roster with unicode names and titles that need escaping.
+
+Usage:
+    python benchmarks/bench_vcard.py [--rows 100000] [--batch 1000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from generate_site import ContactCardSiteGenerator  # noqa: E402
+from synthetic_roster import FIELDS, make_rows  # noqa: E402
+from vcard import serialize, serialize_many  # noqa: E402
+
+ORGANIZATION_NAME = "Scalewave"
+
+
+def legacy_site_vcard(member):
+    """The site generator's builder before the shared serializer."""
+    vcf_lines = [
+        "BEGIN:VCARD",
+        "VERSION:3.0",
+        f"FN:{member.first_name} {member.last_name}",
+        f"N:{member.last_name};{member.first_name};;;"
+    ]
+    if member.title:
+        vcf_lines.append(f"TITLE:{member.title}")
+    if member.company_name:
+        vcf_lines.append(f"ORG:{member.company_name}")
+    if member.phone:
+        vcf_lines.append(f"TEL;TYPE=WORK,VOICE:{member.phone_clean}")
+    if member.email:
+        vcf_lines.append(f"EMAIL;TYPE=WORK:{member.email}")
+    if member.linkedin_url:
+        vcf_lines.append(f"URL;TYPE=LinkedIn:{member.linkedin_url}")
+    if member.twitter_handle:
+        twitter_url = f"https://twitter.com/{member.twitter_handle.lstrip('@')}"
+        vcf_lines.append(f"URL;TYPE=Twitter:{twitter_url}")
+    if member.avatar_path:
+        vcf_lines.append(f"PHOTO;VALUE=URL:{member.avatar_thumbnail or member.avatar_path}")
+    vcf_lines.append("END:VCARD")
+    return '\n'.join(vcf_lines)
+
+
+def legacy_escape_vcard(value):
+    return (value or "").replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+
+
+def legacy_wallet_vcard(member_data):
+    """The wallet script's builder before the shared serializer."""
+    first = member_data['first_name'].strip()
+    last = member_data['last_name'].strip()
+    phone = ''.join(c for c in member_data.get('phone', '') if c.isdigit() or c == '+')
+    lines = [
+        'BEGIN:VCARD',
+        'VERSION:3.0',
+        f'N:{legacy_escape_vcard(last)};{legacy_escape_vcard(first)};;;',
+        f'FN:{legacy_escape_vcard(first)} {legacy_escape_vcard(last)}',
+        f'TITLE:{legacy_escape_vcard(member_data.get("title", "Team Member"))}',
+        f'ORG:{legacy_escape_vcard(ORGANIZATION_NAME)}',
+    ]
+    if phone:
+        lines.append(f'TEL;TYPE=CELL:{phone}')
+    if member_data.get('email'):
+        lines.append(f'EMAIL;TYPE=WORK:{member_data["email"].strip()}')
+    if member_data.get('linkedin_url'):
+        lines.append(f'URL:{member_data["linkedin_url"].strip()}')
+    lines.append('END:VCARD')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def measure(label, function, count):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<38} {count / elapsed:>10,.0f} cards/s  {elapsed / count * 1e6:>6.2f} µs/card")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    generator = ContactCardSiteGenerator()
+    rows = [dict(zip(FIELDS, row)) for row in make_rows(args.rows) if row[5]]
+    members = [generator.prepare_member_data(dict(row)) for row in rows]
+    contacts = [generator.vcard_contact(member) for member in members]
+    count = len(members)
+
+    def batched():
+        for i in range(0, count, args.batch):
+            serialize_many(contacts[i:i + args.batch])
+
+    print(f"📊 vCard serialization, {count:,} contacts")
+    measure("legacy site _build_vcf_content", lambda: [legacy_site_vcard(m) for m in members], count)
+    measure("legacy wallet build_vcard", lambda: [legacy_wallet_vcard(r) for r in rows], count)
+    measure("serialize (incl. VCardContact)",
+            lambda: [serialize(generator.vcard_contact(m)) for m in members], count)
+    measure("serialize", lambda: [serialize(c) for c in contacts], count)
+    measure("serialize, vCard 4.0", lambda: [serialize(c, '4.0') for c in contacts], count)
+    measure(f"serialize_many (batches of {args.batch})", batched, count)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Synthetic rosters for benchmarks
+
+Builds throwaway projects (config, templates, assets and a generated
+``team_data.csv``) of any size. Names are drawn from pools that mix ASCII,
+accented, Cyrillic, Greek, Arabic and CJK names, titles contain the
+characters vCard has to escape, and a small share of rows lacks a required
+field so validation has something to reject. A numeric suffix on the last
+name keeps every member's filename unique.
+
+Avatars are small solid-colour PNGs written without any image library; a
+handful of distinct images are hardlinked to the members that get one, so
+large rosters stay cheap on disk while the avatar pipeline still encodes
+several different sources.
+
+Usage:
+    python benchmarks/synthetic_roster.py TARGET_DIR [--rows 1000] [--avatar-ratio 0.25]
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+
+FIELDS = ['first_name', 'last_name', 'title', 'company_name', 'phone',
+          'email', 'linkedin_url', 'twitter_handle']
+
+FIRST_NAMES = [
+    "Ana", "José", "Zoë", "Øyvind", "François", "Björn", "Chloé", "Łukasz",
+    "Søren", "Siobhán", "Renée", "Juan Bautista", "Anne Marie", "Mei",
+    "Hiroshi", "Aylin", "Yusuf", "Дмитрий", "Ευάγγελος", "محمد", "美玲",
+    "翔太", "Nguyễn Văn", "Samer",
+]
+LAST_NAMES = [
+    "García", "Müller", "Ødegaard", "Nakamura", "O'Brien", "Núñez",
+    "Dubois", "Smith", "Öztürk", "Ahmed", "de la Cruz", "Kowalski",
+    "Иванов", "Παπαδόπουλος", "山田",
+]
+TITLES = [
+    "Software Engineer", "Head of Sales, EMEA", "Engineer; Platform",
+    "Product Designer", "VP Engineering", "Customer Success Manager",
+    "Data Scientist", "",
+]
+
+# Share of rows without an email (rejected by validation)
+INVALID_EVERY = 97
+
+# Distinct avatar images shared by the members that have an avatar
+AVATAR_COLORS = [
+    (31, 75, 140), (11, 33, 255), (200, 60, 60), (60, 160, 90),
+    (240, 180, 40), (120, 80, 200), (30, 30, 30), (220, 220, 220),
+]
+AVATAR_SIZE = 256
+
+
+def make_rows(count):
+    """Yield ``count`` synthetic CSV rows as lists in FIELDS order."""
+    for i in range(count):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = f"{LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+        email = "" if i % INVALID_EVERY == INVALID_EVERY - 1 else f"member{i}@example.com"
+        yield [
+            first,
+            last,
+            TITLES[i % len(TITLES)],
+            "ScaleWave",
+            f"+34 6{i % 10**8:08d}" if i % 5 else "",
+            email,
+            f"https://www.linkedin.com/in/member-{i}/" if i % 3 else "",
+            f"member{i}" if i % 4 == 0 else "",
+        ]
+
+
+def write_roster(csv_file, count):
+    """Write a synthetic team_data.csv with ``count`` rows."""
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(make_rows(count))
+
+
+def png_bytes(width, height, rgb):
+    """Encode a solid-colour RGB PNG."""
+    row = b'\x00' + bytes(rgb) * width
+    pixels = zlib.compress(row * height, 9)
+
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data +
+                struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', pixels) + chunk(b'IEND', b'')
+
+
+def write_avatars(project_dir, ratio):
+    """Give roughly ``ratio`` of the members an avatar in assets/team/.
+
+    Returns the number of avatars written.
+    """
+    from generate_site import ContactCardSiteGenerator
+
+    if ratio <= 0:
+        return 0
+    project_dir = Path(project_dir)
+    generator = ContactCardSiteGenerator(project_dir)
+    team_dir = generator.assets_dir / "team"
+    team_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = []
+    for number, rgb in enumerate(AVATAR_COLORS):
+        source = project_dir / f".avatar-{number}.png"
+        source.write_bytes(png_bytes(AVATAR_SIZE, AVATAR_SIZE, rgb))
+        sources.append(source)
+
+    every = max(1, round(1 / ratio))
+    written = 0
+    for i, row in enumerate(generator.iter_csv_data()):
+        if i % every:
+            continue
+        slug = generator.clean_filename(row['first_name'], row['last_name'])
+        source = sources[written % len(sources)]
+        target = team_dir / f"{slug}.png"
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+        written += 1
+    return written
+
+
+def make_project(target_dir, rows, avatar_ratio=0.0):
+    """Create a complete throwaway project with a synthetic roster.
+
+    Returns the number of avatars written.
+    """
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(REPO_DIR / "config.json", target_dir / "config.json")
+    shutil.copytree(REPO_DIR / "templates", target_dir / "templates")
+    shutil.copytree(REPO_DIR / "assets", target_dir / "assets",
+                    ignore=shutil.ignore_patterns('team'))
+    write_roster(target_dir / "team_data.csv", rows)
+    return write_avatars(target_dir, avatar_ratio)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('target_dir')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--avatar-ratio', type=float, default=0.0,
+                        help="share of members with an avatar (0-1)")
+    args = parser.parse_args(argv)
+
+    if Path(args.target_dir).exists():
+        parser.error(f"{args.target_dir} already exists")
+    avatars = make_project(args.target_dir, args.rows, args.avatar_ratio)
+    print(f"📁 Created {args.target_dir}: {args.rows:,} rows, {avatars:,} avatars")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
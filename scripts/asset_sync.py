@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Incremental Asset Sync
+
+An rsync-like mirror of one directory tree into another. Files whose size
+and modification time match are left alone; when only the mtime differs the
+contents are hashed before deciding to copy. Files and directories missing
+from the source are removed from the target, so a no-op sync writes nothing.
+
+New or changed files can be hardlinked or reflinked (copy-on-write clone)
+instead of copied when both trees live on the same filesystem; any link
+that fails falls back to a regular copy.
+
+The sync can also publish content-hash fingerprinted aliases of the assets
+(``css/style.css`` -> ``css/style.3f9a1c2b.css``), which never change
+content and can therefore be cached by browsers and CDNs forever.
+
+Several processes may sync the same tree at once (e.g. card server workers
+starting together): every process writes its own temporary files, and
+files another process already removed are skipped.
+"""
+
+import errno
+import filecmp
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path, PurePosixPath
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks
+    fcntl = None
+
+# ioctl request number of FICLONE (Linux, Btrfs/XFS/...)
+FICLONE = 0x40049409
+
+LINK_MODES = ('copy', 'hardlink', 'reflink')
+
+# Suffix of the temporary files files are placed through, and the age after
+# which one is considered left over from a crashed sync
+TMP_SUFFIX = ".sync-tmp"
+TMP_MAX_AGE = 3600
+
+
+def _reflink(src, dst):
+    """Clone src into dst with FICLONE; raises OSError when unsupported."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform")
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dst)
+
+
+def _place_file(src, dst, link_mode):
+    """Put src at dst atomically using link_mode. Returns the method used."""
+    # Unique per process, so concurrent syncs never share a temporary file
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}{TMP_SUFFIX}")
+    if tmp.exists():
+        tmp.unlink()
+
+    method = 'copy'
+    try:
+        if link_mode == 'hardlink':
+            os.link(src, tmp)
+            method = 'hardlink'
+        elif link_mode == 'reflink':
+            _reflink(src, tmp)
+            method = 'reflink'
+    except OSError:
+        if tmp.exists():
+            tmp.unlink()
+
+    if method == 'copy':
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return method
+
+
+def _is_abandoned(tmp):
+    """True if a temporary file is old enough to be left over from a crashed sync."""
+    try:
+        # ctime, since copies and hardlinks carry the source's mtime
+        return time.time() - tmp.stat().st_ctime > TMP_MAX_AGE
+    except FileNotFoundError:
+        return False
+
+
+def _is_up_to_date(src_stat, dst, src):
+    """Decide whether dst already matches src (size/mtime, then content)."""
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+    if dst_stat.st_size != src_stat.st_size:
+        return False
+    if dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+        return True
+    if filecmp.cmp(src, dst, shallow=False):
+        # Same bytes: only bring the mtime in line so the next sync is a
+        # pure metadata check
+        shutil.copystat(src, dst)
+        return True
+    return False
+
+
+def fingerprint_name(relative_path, digest):
+    """Insert a short content digest before the extension of an asset path."""
+    path = PurePosixPath(relative_path)
+    return str(path.with_name(f"{path.stem}.{digest[:8]}{path.suffix}"))
+
+
+def build_fingerprint_manifest(source_dir, exclude=(), overrides=None):
+    """Map every asset path to its content-hash fingerprinted name.
+
+    Paths are relative to source_dir with forward slashes. Top-level
+    directories listed in ``exclude`` are skipped. ``overrides`` maps paths
+    to the file actually published for them (see sync_tree), whose content
+    is hashed instead.
+    """
+    source_dir = Path(source_dir)
+    overrides = overrides or {}
+    manifest = {}
+    for root, dirs, files in os.walk(source_dir):
+        relative_root = Path(root).relative_to(source_dir)
+        if relative_root == Path('.'):
+            dirs[:] = [d for d in dirs if d not in exclude]
+        dirs.sort()
+        for name in sorted(files):
+            relative_path = (relative_root / name).as_posix()
+            published = overrides.get(relative_path, Path(root) / name)
+            digest = hashlib.sha256(Path(published).read_bytes()).hexdigest()
+            manifest[relative_path] = fingerprint_name(relative_path, digest)
+    return manifest
+
+
+def sync_tree(source_dir, target_dir, link_mode='copy', aliases=None, sidecar_suffixes=(),
+              overrides=None):
+    """Mirror source_dir into target_dir, touching only what changed.
+
+    ``aliases`` maps extra target paths to the source path they are a copy
+    of (both relative, forward slashes), e.g. the values and keys of a
+    fingerprint manifest; they are synced and kept like regular files.
+    Target files named like a synced file plus one of ``sidecar_suffixes``
+    (e.g. precompressed ``style.css.gz``) are kept as well. ``overrides``
+    maps source paths to another file to publish in their place, such as a
+    minified stylesheet.
+
+    Returns a dict counting ``copied``, ``linked``, ``unchanged`` and
+    ``removed`` files.
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode: {link_mode} (expected one of {', '.join(LINK_MODES)})")
+
+    source_dir = Path(source_dir)
+    target_dir = Path(target_dir)
+    overrides = {path: Path(file) for path, file in (overrides or {}).items()}
+    stats = {'copied': 0, 'linked': 0, 'unchanged': 0, 'removed': 0}
+
+    wanted = set()
+    for root, dirs, files in os.walk(source_dir):
+        relative_root = Path(root).relative_to(source_dir)
+        (target_dir / relative_root).mkdir(parents=True, exist_ok=True)
+        wanted.add(relative_root)
+
+        for name in files:
+            src = overrides.get((relative_root / name).as_posix(), Path(root) / name)
+            dst = target_dir / relative_root / name
+            wanted.add(relative_root / name)
+
+            if _is_up_to_date(src.stat(), dst, src):
+                stats['unchanged'] += 1
+                continue
+
+            method = _place_file(src, dst, link_mode)
+            stats['copied' if method == 'copy' else 'linked'] += 1
+
+    for alias, original in (aliases or {}).items():
+        src = overrides.get(original, source_dir / original)
+        dst = target_dir / alias
+        wanted.add(Path(alias))
+
+        if _is_up_to_date(src.stat(), dst, src):
+            stats['unchanged'] += 1
+            continue
+
+        method = _place_file(src, dst, link_mode)
+        stats['copied' if method == 'copy' else 'linked'] += 1
+
+    # Remove stale files first, then directories that are no longer needed
+    # (deepest first)
+    for root, dirs, files in os.walk(target_dir, topdown=False):
+        relative_root = Path(root).relative_to(target_dir)
+        for name in files:
+            if relative_root / name in wanted:
+                continue
+            if any(name.endswith(suffix) and relative_root / name[:-len(suffix)] in wanted
+                   for suffix in sidecar_suffixes):
+                continue
+            path = Path(root) / name
+            if name.endswith(TMP_SUFFIX) and not _is_abandoned(path):
+                continue  # being placed by another sync
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            stats['removed'] += 1
+        if relative_root not in wanted:
+            try:
+                Path(root).rmdir()
+            except OSError:
+                pass  # removed by another sync, or it holds another sync's file
+
+    return stats
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Avatar Image Derivatives
+
+Turns the team photos in assets/team/ into square, size-bucketed WebP and
+JPEG variants for the contact card ``srcset``, plus a small JPEG thumbnail
+for the VCF ``PHOTO`` line.
+
+Encoded variants are cached in a directory per source hash, so a photo is
+only re-encoded when its bytes (or the encoding settings) change. Output
+filenames contain that hash, which makes them safe to cache forever.
+
+Requirements:
+    - Pillow (optional; without it avatars are served unchanged)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional, see pillow_available()
+    Image = None
+    ImageOps = None
+
+
+DEFAULT_SETTINGS = {
+    'sizes': [96, 192, 384],
+    'formats': ['webp', 'jpeg'],
+    'quality': 80,
+    'thumbnail_size': 96,
+}
+
+FORMAT_EXTENSIONS = {'webp': '.webp', 'jpeg': '.jpg'}
+PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+VARIANTS_FILE = "variants.json"
+
+
+def pillow_available():
+    """Return True if Pillow can be imported."""
+    return Image is not None
+
+
+def source_key(source_path, settings):
+    """Hash an avatar's bytes together with the encoding settings."""
+    digest = hashlib.sha256(Path(source_path).read_bytes())
+    digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_cached_variants(cache_dir):
+    """Return the variant list of a finished cache entry, or None."""
+    try:
+        with open(Path(cache_dir) / VARIANTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _square(image):
+    """Center-crop an image to a square."""
+    side = min(image.size)
+    left = (image.width - side) // 2
+    top = (image.height - side) // 2
+    return image.crop((left, top, left + side, top + side))
+
+
+def encode_avatar(source_path, cache_dir, settings):
+    """Encode every variant of one avatar into cache_dir.
+
+    Images are never upscaled: buckets larger than the source are encoded at
+    the source size. ``variants.json`` is written last, so an interrupted run
+    leaves an entry that is simply encoded again next time.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source_path) as original:
+        image = _square(ImageOps.exif_transpose(original).convert('RGB'))
+
+    variants = []
+    for size in settings['sizes']:
+        width = min(size, image.width)
+        resized = image.resize((width, width), Image.LANCZOS)
+        for fmt in settings['formats']:
+            name = f"{size}{FORMAT_EXTENSIONS[fmt]}"
+            resized.save(cache_dir / name, PIL_FORMATS[fmt],
+                         quality=settings['quality'], optimize=True)
+            variants.append({'size': size, 'width': width, 'format': fmt, 'file': name})
+
+    thumb_width = min(settings['thumbnail_size'], image.width)
+    image.resize((thumb_width, thumb_width), Image.LANCZOS).save(
+        cache_dir / "thumb.jpg", 'JPEG', quality=settings['quality'], optimize=True
+    )
+    variants.append({'size': 'thumb', 'width': thumb_width, 'format': 'jpeg', 'file': "thumb.jpg"})
+
+    tmp_file = cache_dir / f"{VARIANTS_FILE}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(variants, f)
+    os.replace(tmp_file, cache_dir / VARIANTS_FILE)
+    return variants
+
+
+def _encode_task(args):
+    """Pool entry point for encode_avatar; returns None if the image is unusable."""
+    try:
+        return encode_avatar(*args)
+    except Exception:
+        return None
+
+
+def build_avatar_derivatives(sources, cache_root, output_dir, settings, jobs=1):
+    """Create (or reuse) the derivatives of every avatar and publish them.
+
+    ``sources`` maps member slugs to their avatar file. Missing cache entries
+    are encoded once per unique photo, on a process pool when ``jobs`` is
+    above 1. Cached files are then copied to ``output_dir`` as
+    ``<slug>-<key>-<size>.<ext>``, and files there that no longer belong to
+    any avatar are removed.
+
+    Returns ``(derivatives, encoded_count, cached_count, failed_slugs)``
+    where derivatives maps each slug to its list of published variants
+    (dicts with the output ``file`` name), and the counts are unique photos
+    encoded now and found in the cache. Avatars Pillow cannot read are
+    listed in failed_slugs.
+    """
+    cache_root = Path(cache_root)
+    output_dir = Path(output_dir)
+
+    keys = {slug: source_key(path, settings) for slug, path in sources.items()}
+    cached = {key: load_cached_variants(cache_root / key) for key in set(keys.values())}
+    cached_count = sum(1 for key_variants in cached.values() if key_variants is not None)
+    variants = {slug: cached[key] for slug, key in keys.items()}
+
+    # Members sharing a photo share its cache entry, so each key is encoded
+    # once (never by two workers at a time) and fanned out afterwards
+    missing = {}
+    for slug, slug_variants in variants.items():
+        if slug_variants is None:
+            missing.setdefault(keys[slug], sources[slug])
+    to_encode = [(str(path), str(cache_root / key), settings) for key, path in missing.items()]
+
+    if jobs > 1 and len(to_encode) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            encoded = list(executor.map(_encode_task, to_encode))
+    else:
+        encoded = [_encode_task(task) for task in to_encode]
+    encoded = dict(zip(missing, encoded))
+    for slug, slug_variants in variants.items():
+        if slug_variants is None:
+            variants[slug] = encoded[keys[slug]]
+    failed = sorted(slug for slug, slug_variants in variants.items() if slug_variants is None)
+
+    # Publish under content-addressed names; an existing file is up to date
+    output_dir.mkdir(parents=True, exist_ok=True)
+    derivatives = {}
+    published = set()
+    for slug, slug_variants in variants.items():
+        if slug_variants is None:
+            continue
+        derivatives[slug] = []
+        for variant in slug_variants:
+            ext = FORMAT_EXTENSIONS[variant['format']]
+            name = f"{slug}-{keys[slug]}-{variant['size']}{ext}"
+            target = output_dir / name
+            if not target.exists():
+                shutil.copy2(cache_root / keys[slug] / variant['file'], target)
+            published.add(name)
+            derivatives[slug].append(dict(variant, file=name))
+
+    for entry in os.scandir(output_dir):
+        if entry.is_file() and entry.name not in published:
+            os.remove(entry.path)
+
+    encoded_count = sum(1 for key_variants in encoded.values() if key_variants is not None)
+    return derivatives, encoded_count, cached_count, failed
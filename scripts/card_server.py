@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Dynamic Card Server
+
+An optional WSGI app (Flask) that serves the site straight from
+team_data.csv instead of from the generated files. The roster is loaded
+once into memory and indexed by file name; contact cards, the index page,
+its member chunks and the VCF files are rendered on request by the same
+generator code as the static build, so both produce identical pages:
+
+    /                             index page
+    /members/page-<n>.json        index chunks (``index.page_size``)
+    /html/<filename>.html         contact card
+    /vcf/<filename>.vcf           vCard
+    /contacts/<export>.vcf[.gz]   bulk exports (``vcf_exports``)
+    /assets/..., /avatars/...     synced assets and avatar variants
+
+Rendered responses are kept in a bounded LRU cache (``server.cache_size``
+entries). Cards and vCards are cached by the member's data, so a roster
+reload only re-renders the members that changed; the index and the
+exports by roster version. Every response carries a strong ``ETag`` (a
+hash of the body) and ``Cache-Control: public, max-age=<server.max_age>``,
+and conditional requests with a matching ``If-None-Match`` get a 304.
+
+The CSV is checked for changes at most every ``server.reload_interval``
+seconds. A changed roster is loaded next to the current one and swapped in
+with a single assignment; requests in flight keep the roster they started
+with, and a roster that fails to load leaves the current one in place.
+Changes to config.json, templates or assets need a restart.
+
+Flask is optional; nothing else in the project imports this module.
+
+Usage:
+    python scripts/card_server.py [--host 127.0.0.1] [--port 8000]
+    gunicorn --preload --chdir scripts --workers 4 "card_server:create_app()"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    from flask import Flask, abort, request, send_from_directory
+except ImportError:  # Flask is optional, see flask_available()
+    Flask = None
+
+from generate_site import ContactCardSiteGenerator
+from vcf_exports import GroupPaths, export_order, export_paths, gzip_bytes
+
+DEFAULT_SETTINGS = {
+    'base_url': "",  # overrides deployment.base_url in the rendered pages
+    'cache_size': 1024,
+    'max_age': 300,
+    'reload_interval': 2.0,
+}
+
+# Cache lifetime (seconds) of fingerprinted assets, whose names change with their content
+FINGERPRINTED_MAX_AGE = 31536000
+
+CONTENT_TYPES = {
+    'html': "text/html; charset=utf-8",
+    'json': "application/json",
+    'vcf': "text/vcard; charset=utf-8",
+    'gz': "application/gzip",
+}
+
+
+def flask_available():
+    """Return True if Flask can be imported."""
+    return Flask is not None
+
+
+def server_settings(config):
+    """Return the server settings of a config dict, with defaults filled in."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get('server', {}))
+    return settings
+
+
+class Roster:
+    """One load of the roster, indexed for lookups; never changed once built."""
+
+    def __init__(self, members, split_by=(), gzip_variants=False, source=None):
+        self.members = tuple(members)
+        self.gzip_variants = gzip_variants
+        self.source = source  # (mtime_ns, size) of the CSV it was read from
+        self.by_filename = {member.filename: member for member in self.members}
+
+        exports = OrderedDict()  # relative path -> (label, members)
+        groups = GroupPaths()
+        for member in self.members:
+            for relative_path, label in export_paths(member, split_by, groups):
+                exports.setdefault(relative_path, (label, []))[1].append(member)
+        self.exports = exports
+
+        digest = hashlib.sha256()
+        for member in self.members:
+            digest.update(json.dumps(member.astuple(), ensure_ascii=False).encode('utf-8'))
+        self.version = digest.hexdigest()[:16]
+
+    def export_entries(self):
+        """The exports as VcfExports.close() reports them, for the index page."""
+        entries = [{'path': path, 'label': label, 'count': len(members),
+                    'gzip_path': f"{path}.gz" if self.gzip_variants else None, 'updated': False}
+                   for path, (label, members) in self.exports.items()]
+        return sorted(entries, key=export_order)
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered responses: key -> (body bytes, etag)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, render):
+        """Return ``(body, etag, hit)`` of key, calling ``render()`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry + (True,)
+            self.misses += 1
+
+        # Rendered outside the lock; two threads missing the same key at
+        # once both render it, which is harmless
+        body = render()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        entry = (body, hashlib.sha256(body).hexdigest()[:32])
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry + (False,)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CardSite:
+    """The generator, the current roster and the render cache of a server."""
+
+    def __init__(self, base_dir=None, settings=None):
+        # Absolute paths, since Flask resolves relative ones against its root_path
+        if base_dir is not None:
+            base_dir = Path(base_dir).resolve()
+        self.generator = generator = ContactCardSiteGenerator(base_dir)
+        self.settings = settings or server_settings(generator.config)
+        if self.settings['base_url']:
+            generator.config['deployment']['base_url'] = self.settings['base_url'].rstrip('/')
+        export_config = generator.config.get('vcf_exports', {})
+        self.split_by = export_config.get('split_by', [])
+        self.gzip_variants = export_config.get('gzip', False)
+        self.cache = RenderCache(self.settings['cache_size'])
+
+        # Assets and avatar variants are prepared once, exactly as a build
+        # does, so rendered pages reference the same fingerprinted files
+        generator.copy_assets_to_output()
+        generator.build_avatar_index()
+        generator.generate_avatar_derivatives()
+
+        self._reload_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self.roster = self.load_roster()
+        self._seen = self.roster.source
+        print(f"📇 Loaded {len(self.roster.members)} team members (roster {self.roster.version})")
+
+    def _csv_state(self):
+        try:
+            stat = os.stat(self.generator.csv_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_roster(self):
+        """Read, validate and index the CSV into a new Roster."""
+        generator = self.generator
+        source = self._csv_state()
+        members = generator.iter_prepared_members(generator.iter_csv_data())
+        return Roster(members, self.split_by, self.gzip_variants, source)
+
+    def current_roster(self):
+        """Return the current roster, reloading it first if the CSV changed."""
+        now = time.monotonic()
+        if now - self._checked < self.settings['reload_interval']:
+            return self.roster
+        # One thread checks and reloads; the others keep serving the
+        # current roster meanwhile
+        if not self._reload_lock.acquire(blocking=False):
+            return self.roster
+        try:
+            self._checked = now
+            # A CSV that failed to load is only tried again once it changes
+            state = self._csv_state()
+            if state != self._seen:
+                self._seen = state
+                self.reload()
+        finally:
+            self._reload_lock.release()
+        return self.roster
+
+    def reload(self):
+        """Load the roster again and swap it in; keeps the old one on errors."""
+        try:
+            roster = self.load_roster()
+        except Exception as e:
+            print(f"❌ Roster reload failed, still serving roster {self.roster.version}: {e}")
+            return False
+        if not roster.members:
+            print(f"⚠️  Warning: Reloaded roster is empty, still serving roster {self.roster.version}")
+            return False
+        self.roster = roster
+        print(f"🔁 Reloaded {len(roster.members)} team members (roster {roster.version})")
+        return True
+
+    def index_page(self, roster):
+        """Render the index page of a roster."""
+        generator = self.generator
+        first_page_size, page_size = generator.index_page_sizes()
+        first_page = roster.members[:first_page_size] if page_size > 0 else roster.members
+        context = generator.index_context(first_page, self.chunk_count(roster),
+                                          roster.export_entries())
+        return generator.render_index_page(context)
+
+    def chunk_count(self, roster):
+        """Number of index chunks of a roster."""
+        first_page_size, page_size = self.generator.index_page_sizes()
+        if page_size <= 0:
+            return 0
+        rest = max(0, len(roster.members) - first_page_size)
+        return -(-rest // page_size)
+
+    def index_chunk(self, roster, number):
+        """Render index chunk ``number`` (from 1) of a roster."""
+        first_page_size, page_size = self.generator.index_page_sizes()
+        start = first_page_size + (number - 1) * page_size
+        return self.generator.render_index_chunk(roster.members[start:start + page_size])
+
+
+def create_app(base_dir=None, settings=None):
+    """Create the Flask app of a project directory (the repository by default)."""
+    if not flask_available():
+        raise ImportError("The card server needs Flask (pip install flask gunicorn)")
+
+    site = CardSite(base_dir, settings)
+    generator = site.generator
+    max_age = site.settings['max_age']
+    app = Flask(__name__, static_folder=None)
+    app.extensions['card_site'] = site
+
+    def respond(key, kind, render):
+        body, etag, hit = site.cache.get(key, render)
+        response = app.response_class(body, content_type=CONTENT_TYPES[kind])
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.headers['X-Cache'] = 'hit' if hit else 'miss'
+        return response.make_conditional(request)
+
+    @app.route('/')
+    @app.route('/index.html')
+    def index():
+        roster = site.current_roster()
+        return respond(('index', roster.version), 'html', lambda: site.index_page(roster))
+
+    @app.route(f"/{generator.url_path(generator.index_chunks_dir)}/page-<int:number>.json")
+    def index_chunk(number):
+        roster = site.current_roster()
+        if not 1 <= number <= site.chunk_count(roster):
+            abort(404)
+        return respond(('chunk', roster.version, number), 'json',
+                       lambda: site.index_chunk(roster, number))
+
+    @app.route('/html/<filename>.html')
+    def contact_card(filename):
+        member = site.current_roster().by_filename.get(filename)
+        if member is None:
+            abort(404)
+        return respond(('card', member.astuple()), 'html',
+                       lambda: generator.render_contact_card(member))
+
+    @app.route('/vcf/<filename>.vcf')
+    def vcf(filename):
+        member = site.current_roster().by_filename.get(filename)
+        if member is None:
+            abort(404)
+        return respond(('vcf', member.astuple()), 'vcf', lambda: generator.render_vcf(member))
+
+    @app.route(f"/{generator.url_path(generator.vcf_exports_dir)}/<path:path>")
+    def vcf_export(path):
+        roster = site.current_roster()
+        compressed = roster.gzip_variants and path.endswith('.gz')
+        export = roster.exports.get(path[:-len('.gz')] if compressed else path)
+        if export is None:
+            abort(404)
+
+        def render():
+            vcards = "".join(generator.render_vcf(member) for member in export[1])
+            # Same bytes as the static build's reproducible .gz files
+            return gzip_bytes(vcards.encode('utf-8')) if compressed else vcards
+
+        return respond(('export', roster.version, path), 'gz' if compressed else 'vcf', render)
+
+    # Fingerprinted asset names change with their content, so they can be
+    # cached for good; the rest (original names, team photos) follow
+    # max_age like the pages
+    fingerprinted = frozenset(generator.asset_manifest.values())
+    assets_dir = (generator.output_dir / "assets").resolve()
+    avatars_dir = generator.avatars_output_dir.resolve()
+
+    @app.route('/assets/<path:path>')
+    def asset(path):
+        return send_from_directory(assets_dir, path,
+                                   max_age=FINGERPRINTED_MAX_AGE if path in fingerprinted else max_age)
+
+    @app.route('/avatars/<path:path>')
+    def avatar(path):
+        return send_from_directory(avatars_dir, path, max_age=max_age)
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the contact cards from the roster in memory.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="port to listen on (default: 8000)")
+    args = parser.parse_args(argv)
+
+    if not flask_available():
+        print("❌ Error: Flask is not installed (pip install flask gunicorn)")
+        return 1
+    try:
+        app = create_app()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(f"🌐 Card server on http://{args.host}:{args.port}/ (use gunicorn in production)")
+    app.run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,7 +6,20 @@ A clean, maintainable script for generating HTML contact cards and VCF files
 using Jinja2 templating and centralized configuration.
 
 Usage:
-    python scripts/generate_site.py
+    python scripts/generate_site.py [--force] [--jobs N] [--precompress] [--profile [cpu|memory]]
+    python scripts/generate_site.py --compile-templates
+    python scripts/generate_site.py --watch [--port 8000] [--jobs N]
+
+    --force         Ignore the build manifest and regenerate every output file
+    --jobs N        Render contact cards with N worker processes (0 = all cores)
+    --precompress   Write .gz/.br siblings of the text output files
+    --profile       Profile the build with cProfile (cpu, the default) or
+                    tracemalloc (memory); stage timings always go to
+                    build-report.json
+    --compile-templates
+                    Precompile the templates into Python modules and exit
+    --watch         Rebuild on every change and serve a live-reloading
+                    preview of output/ on --port
 
 Requirements:
     - Jinja2
@@ -15,16 +28,157 @@ Requirements:
     - Templates in templates/ directory
 """
 
+import argparse
 import csv
+import hashlib
+import itertools
 import json
 import os
 import re
 import shutil
 import time
-import subprocess
-import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import jinja2
+from jinja2 import (ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    ModuleLoader, select_autoescape)
+
+from asset_sync import build_fingerprint_manifest, sync_tree
+from avatar_images import DEFAULT_SETTINGS as AVATAR_IMAGE_DEFAULTS
+from avatar_images import build_avatar_derivatives, pillow_available
+from build_stats import PROFILE_MODES, BuildStats, profile_call
+from member_manifest import MemberManifest
+from minify import MinifyCache, minify_html as minify_page
+from precompress import SIDECAR_SUFFIXES, brotli_available, precompress_tree
+from precompress import DEFAULT_EXTENSIONS as PRECOMPRESS_EXTENSIONS
+from vcard import SERIALIZER_VERSION as VCARD_SERIALIZER_VERSION
+from vcard import VCardContact, serialize as serialize_vcard
+from vcf_exports import VcfExports
+from wallet_passes import WalletPasses, wallet_settings
+from wallet_passes import check_requirements as check_wallet_requirements
+from watch import BuildNotifier, iter_changes, start_preview_server
+
+
+# Precompiled patterns used when preparing every member
+_NON_FILENAME_CHARS = re.compile(r'[^a-z0-9\-]')
+_REPEATED_DASHES = re.compile(r'-+')
+_NON_PHONE_CHARS = re.compile(r'[^\d+]')
+
+# Avatar image extensions, in lookup priority order
+AVATAR_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# Members per task handed to the render worker pool, and tasks kept in
+# flight per worker while the main process prepares the next members
+RENDER_CHUNK_SIZE = 64
+RENDER_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Templates rendered by the generator, loaded once per run and precompiled
+# by --compile-templates
+SITE_TEMPLATES = ('base.html', 'contact-card.html', 'index.html')
+
+# The few fields of a member the index page needs; kept for the whole build
+# while full member records are streamed through and dropped
+MemberSummary = namedtuple('MemberSummary', ['first_name', 'last_name', 'title', 'filename'])
+
+
+class PreparedMember:
+    """Template-ready data of one team member, computed once per CSV row.
+
+    The same record is shared by every output stage (HTML card, VCF, index
+    page), so filename slugging, phone formatting and the avatar lookup run
+    a single time per member. ``__slots__`` keeps large rosters compact.
+    Templates read the fields as attributes, e.g. ``member.phone_clean``.
+    """
+
+    __slots__ = (
+        'first_name', 'last_name', 'title', 'company_name', 'phone', 'email',
+        'linkedin_url', 'twitter_handle',
+        # Computed fields
+        'filename', 'phone_formatted', 'phone_clean', 'avatar_path',
+        'avatar_srcset', 'avatar_srcset_webp', 'avatar_thumbnail',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name, ""))
+
+    def __repr__(self):
+        return f"PreparedMember({self.filename!r})"
+
+    @property
+    def full_name(self):
+        """First and last name separated by a space."""
+        return f"{self.first_name} {self.last_name}"
+
+    def to_dict(self):
+        """Return the fields as a plain dict (for hashing and JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def astuple(self):
+        """Return the field values as a tuple (hashable, e.g. as a cache key)."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def summary(self):
+        """Return the MemberSummary the index page is rendered from."""
+        return MemberSummary(self.first_name, self.last_name, self.title, self.filename)
+
+
+class IndexPages:
+    """Splits the index entries of a build into the first page and JSON chunks.
+
+    Entries are added while the roster streams through the build. The first
+    ``first_page_size`` stay in memory for the index page; the rest are
+    written to ``page-<n>.json`` as soon as a chunk is full, and only when
+    its content changed. With a ``page_size`` of 0 everyone stays on the
+    first page.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.first_page_size, self.page_size = generator.index_page_sizes()
+        self.first_page = []
+        self.count = 0
+        self.chunk_count = 0
+        self.chunks_written = 0
+        self._chunk = []
+        generator.index_chunks_dir.mkdir(parents=True, exist_ok=True)
+
+    def add(self, entry):
+        """Add the next index entry (a MemberSummary or PreparedMember)."""
+        self.count += 1
+        if self.page_size <= 0 or len(self.first_page) < self.first_page_size:
+            self.first_page.append(entry)
+            return
+        self._chunk.append(entry)
+        if len(self._chunk) >= self.page_size:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        self.chunk_count += 1
+        data = self.generator.render_index_chunk(self._chunk).encode('utf-8')
+        self._chunk = []
+        chunk_file = self.generator.index_chunks_dir / f"page-{self.chunk_count}.json"
+        try:
+            if chunk_file.stat().st_size == len(data) and chunk_file.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+        chunk_file.write_bytes(data)
+        self.chunks_written += 1
+
+    def close(self):
+        """Write the last chunk and remove chunks left over from a larger roster.
+
+        Returns the number of chunks.
+        """
+        if self._chunk:
+            self._write_chunk()
+        for stale_chunk in self.generator.index_chunks_dir.glob("page-*.json"):
+            number = stale_chunk.stem[len("page-"):]
+            if not number.isdigit() or int(number) > self.chunk_count:
+                stale_chunk.unlink()
+        return self.chunk_count
 
 
 class ContactCardSiteGenerator:
@@ -39,6 +193,13 @@ class ContactCardSiteGenerator:
         
         self.base_dir = base_dir
         self.config = self._load_config()
+        self._avatar_index = None
+        self._avatar_derivatives = {}
+        self.asset_manifest = {}
+        self._templates = {}
+        self.asset_sync_stats = {}
+        self.stats = BuildStats()
+        self._report_info = {}
         self._setup_paths()
         self._setup_jinja()
         
@@ -64,6 +225,23 @@ class ContactCardSiteGenerator:
         self.assets_dir = self.base_dir / paths['assets_dir']
         self.passes_output_dir = self.base_dir / paths['passes_output_dir']
         self.signed_passes_dir = self.base_dir / paths['signed_passes_dir']
+        self.build_manifest_file = self.base_dir / paths.get(
+            'build_manifest', '.build/manifest.json'
+        )
+        self.member_manifest_file = self.base_dir / paths.get(
+            'member_manifest', '.build/members.sqlite3'
+        )
+        self.avatars_output_dir = self.base_dir / paths.get('avatars_output_dir', 'output/avatars')
+        self.index_chunks_dir = self.base_dir / paths.get('index_chunks_dir', 'output/members')
+        self.vcf_exports_dir = self.base_dir / paths.get('vcf_exports_dir', 'output/contacts')
+        self.minify_cache = MinifyCache(self.base_dir / paths.get('minify_cache_dir', '.build/minify'))
+        self.avatar_cache_dir = self.base_dir / paths.get('avatar_cache_dir', '.build/avatars')
+        self.build_report_file = self.base_dir / paths.get('build_report', 'build-report.json')
+        self.wallet_report_file = self.base_dir / paths.get('wallet_report', 'wallet-report.json')
+        self.jinja_cache_dir = self.base_dir / paths.get('jinja_cache_dir', '.build/jinja')
+        self.compiled_templates_dir = self.base_dir / paths.get(
+            'compiled_templates_dir', '.build/templates'
+        )
         
         # Create output directories
         self.html_output_dir.mkdir(parents=True, exist_ok=True)
@@ -71,30 +249,176 @@ class ContactCardSiteGenerator:
         self.passes_output_dir.mkdir(parents=True, exist_ok=True)
     
     def _setup_jinja(self):
-        """Setup Jinja2 environment for templating."""
+        """Setup Jinja2 environment for templating.
+
+        Compiled templates are kept in an on-disk bytecode cache
+        (``templates.bytecode_cache``), which Jinja keys on the template
+        source, so a new process only re-parses templates that changed.
+        With ``templates.precompiled`` enabled, modules written by
+        ``--compile-templates`` are imported instead of compiling at all, as
+        long as they were built from the current template sources.
+        """
+        template_config = self.config.get('templates', {})
+        loader = FileSystemLoader(self.templates_dir)
+        self.precompiled_templates_used = False
+        if template_config.get('precompiled', False):
+            compiled_dir = self.compiled_templates_path()
+            if compiled_dir.is_dir():
+                loader = ChoiceLoader([ModuleLoader(str(compiled_dir)), loader])
+                self.precompiled_templates_used = True
+        
+        bytecode_cache = None
+        if template_config.get('bytecode_cache', True):
+            self.jinja_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(self.jinja_cache_dir))
+        
         self.jinja_env = Environment(
-            loader=FileSystemLoader(self.templates_dir),
+            loader=loader,
+            bytecode_cache=bytecode_cache,
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
             lstrip_blocks=True
         )
+        self.jinja_env.globals['asset_url'] = self.asset_url
+        self._templates = {}
+    
+    def get_template(self, name):
+        """Return a template, loading it at most once per generator."""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.jinja_env.get_template(name)
+        return template
+    
+    def compiled_templates_path(self):
+        """Directory of the precompiled modules for the current templates.
+
+        The name is a digest of the template sources and the Jinja version,
+        so editing a template (or upgrading Jinja) never picks up stale
+        modules.
+        """
+        digest = hashlib.sha256(jinja2.__version__.encode('utf-8'))
+        for name in SITE_TEMPLATES:
+            digest.update(name.encode('utf-8'))
+            digest.update((self.templates_dir / name).read_bytes())
+        return self.compiled_templates_dir / digest.hexdigest()[:16]
+    
+    def compile_templates(self):
+        """Precompile the site templates into importable Python modules.
+
+        Older compiled versions are removed. Returns the target directory.
+        """
+        target = self.compiled_templates_path()
+        if self.compiled_templates_dir.exists():
+            for old_dir in self.compiled_templates_dir.iterdir():
+                if old_dir != target and old_dir.is_dir():
+                    shutil.rmtree(old_dir)
+        if not target.is_dir():
+            tmp = target.with_name(f".{target.name}.tmp")
+            if tmp.exists():
+                shutil.rmtree(tmp)
+            self.jinja_env.compile_templates(
+                tmp, filter_func=lambda name: name in SITE_TEMPLATES,
+                zip=None, ignore_errors=False
+            )
+            os.replace(tmp, target)
+        return target
+    
+    def asset_url(self, path):
+        """Return the absolute URL of an asset, e.g. ``asset_url('css/style.css')``.
+
+        With ``cache_busting`` enabled the content-hash fingerprinted file
+        from the asset manifest is used (``css/style.3f9a1c2b.css``), so the
+        URL only changes when the file does.
+        """
+        if self.config.get('cache_busting'):
+            path = self.asset_manifest.get(path, path)
+        return f"{self.config['deployment']['base_url']}/assets/{path}"
     
     def copy_assets_to_output(self):
-        """Copy assets directory to output directory for deployment."""
+        """Sync assets directory to output directory for deployment.
+
+        Only new or changed files are written and files removed from
+        assets/ are deleted from the output, so unchanged assets keep their
+        mtimes. ``asset_sync.link_mode`` can be ``copy``, ``hardlink`` or
+        ``reflink``.
+
+        With ``cache_busting`` enabled, every asset (except avatars in
+        team/) is also published under a content-hash fingerprinted name,
+        and the mapping is written to ``asset-manifest.json`` in the output
+        directory and used by ``asset_url``.
+        """
         output_assets_dir = self.output_dir / "assets"
         
-        # Remove existing assets directory in output if it exists
-        if output_assets_dir.exists():
-            shutil.rmtree(output_assets_dir)
-        
-        # Copy the entire assets directory
-        if self.assets_dir.exists():
-            shutil.copytree(self.assets_dir, output_assets_dir)
-            print("📁 Copied assets directory to output folder")
-            return True
-        else:
+        if not self.assets_dir.exists():
             print("⚠️  Warning: Assets directory not found")
             return False
+        
+        overrides = self.minify_stylesheets()
+        
+        if self.config.get('cache_busting'):
+            self.asset_manifest = build_fingerprint_manifest(
+                self.assets_dir, exclude=('team',), overrides=overrides
+            )
+        else:
+            self.asset_manifest = {}
+        
+        link_mode = self.config.get('asset_sync', {}).get('link_mode', 'copy')
+        aliases = {fingerprinted: path for path, fingerprinted in self.asset_manifest.items()}
+        stats = sync_tree(self.assets_dir, output_assets_dir, link_mode, aliases,
+                          sidecar_suffixes=tuple(SIDECAR_SUFFIXES.values()),
+                          overrides=overrides)
+        self.asset_sync_stats = stats
+        
+        # Without fingerprinted assets an old manifest would point to names
+        # that are no longer published
+        manifest_file = self.output_dir / "asset-manifest.json"
+        manifest_json = json.dumps(self.asset_manifest, indent=2, sort_keys=True)
+        if not self.asset_manifest:
+            manifest_file.unlink(missing_ok=True)
+        elif self._hash_file(manifest_file) != self._hash_bytes(manifest_json.encode('utf-8')):
+            manifest_file.write_text(manifest_json, encoding='utf-8')
+        
+        written = stats['copied'] + stats['linked']
+        if written or stats['removed']:
+            print(f"📁 Synced assets to output folder: {written} updated, "
+                  f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+        else:
+            print(f"📁 Assets up to date ({stats['unchanged']} files)")
+        return True
+    
+    def minify_stylesheets(self):
+        """Write minified copies of the stylesheets for the asset sync.
+
+        With ``minify.css`` enabled, every ``.css`` file in assets/ is
+        minified (through the minify cache) into a staging directory, and a
+        file there is only rewritten when its content changes. Returns the
+        ``{asset path: staged file}`` overrides for sync_tree.
+        """
+        if not self.config.get('minify', {}).get('css', False):
+            return {}
+        
+        staging_dir = self.minify_cache.cache_dir / "assets"
+        overrides = {}
+        for css_file in sorted(self.assets_dir.rglob("*.css")):
+            relative_path = css_file.relative_to(self.assets_dir).as_posix()
+            minified = self.minify_cache.minify('css', css_file.read_text(encoding='utf-8'))
+            
+            staged_file = staging_dir / relative_path
+            if not staged_file.exists() or staged_file.read_text(encoding='utf-8') != minified:
+                staged_file.parent.mkdir(parents=True, exist_ok=True)
+                staged_file.write_text(minified, encoding='utf-8')
+            overrides[relative_path] = staged_file
+        return overrides
+    
+    def minify_html(self, html_content):
+        """Minify a rendered page if ``minify.html`` is enabled.
+
+        Pages are not cached: only changed pages are rendered at all, so a
+        page-level cache would almost never hit and only grow.
+        """
+        if not self.config.get('minify', {}).get('html', False):
+            return html_content
+        return minify_page(html_content)
     
     def clean_filename(self, first_name, last_name):
         """Generate a clean filename from first and last name."""
@@ -104,8 +428,8 @@ class ContactCardSiteGenerator:
         filename = f"{first_name_clean}-{last_name_clean}"
         
         # Remove special characters and normalize
-        filename = re.sub(r'[^a-z0-9\-]', '', filename)
-        filename = re.sub(r'-+', '-', filename)
+        filename = _NON_FILENAME_CHARS.sub('', filename)
+        filename = _REPEATED_DASHES.sub('-', filename)
         return filename.strip('-')
     
     def format_phone(self, phone):
@@ -114,7 +438,7 @@ class ContactCardSiteGenerator:
             return ""
         
         # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone)
+        cleaned = _NON_PHONE_CHARS.sub('', phone)
         
         # Format US numbers
         if cleaned.startswith('+1') and len(cleaned) == 12:
@@ -126,32 +450,151 @@ class ContactCardSiteGenerator:
         """Get clean phone number for tel: links."""
         if not phone:
             return ""
-        return re.sub(r'[^\d+]', '', phone)
+        return _NON_PHONE_CHARS.sub('', phone)
     
-    def check_avatar_exists(self, first_name, last_name):
-        """Check if avatar image exists in assets/team/ directory."""
-        filename = self.clean_filename(first_name, last_name)
-        team_dir = self.assets_dir / "team"
+    def build_avatar_index(self):
+        """Scan assets/team/ once into a slug -> avatar filenames index.
+
+        Each slug maps to its candidate files in ``AVATAR_EXTENSIONS``
+        priority order, so lookups need no further filesystem access.
+        Call again to pick up changes to the directory.
+        """
+        index = {}
+        try:
+            entries = list(os.scandir(self.assets_dir / "team"))
+        except FileNotFoundError:
+            entries = []
+        
+        for entry in entries:
+            slug, ext = os.path.splitext(entry.name)
+            if ext in AVATAR_EXTENSIONS and entry.is_file():
+                index.setdefault(slug, []).append(entry.name)
+        
+        for candidates in index.values():
+            candidates.sort(key=lambda name: AVATAR_EXTENSIONS.index(os.path.splitext(name)[1]))
+        
+        self._avatar_index = index
+        return index
+    
+    def _avatar_url(self, slug):
+        """Return the absolute avatar URL for a member slug, or None."""
+        if self._avatar_index is None:
+            self.build_avatar_index()
         
-        if not team_dir.exists():
+        candidates = self._avatar_index.get(slug)
+        if not candidates:
             return None
-            
-        # Check for common image extensions
-        for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            avatar_path = team_dir / f"{filename}{ext}"
-            if avatar_path.exists():
-                # Return absolute path for deployment
-                return f"{self.config['deployment']['base_url']}/assets/team/{filename}{ext}"
-        return None
+        # Return absolute path for deployment
+        return f"{self.config['deployment']['base_url']}/assets/team/{candidates[0]}"
+    
+    def generate_avatar_derivatives(self, jobs=1):
+        """Create resized WebP/JPEG variants of every avatar in output/avatars/.
+
+        Encoded variants are cached by source hash in the avatar cache dir,
+        so only new or changed photos are encoded (on ``jobs`` processes).
+        Without Pillow, or with ``avatar_images.enabled`` set to false, the
+        original images are referenced as before.
+        """
+        self._avatar_derivatives = {}
+        image_config = self.config.get('avatar_images', {})
+        if not image_config.get('enabled', True):
+            return False
+        
+        if self._avatar_index is None:
+            self.build_avatar_index()
+        if not self._avatar_index:
+            return False
+        
+        if not pillow_available():
+            print("⚠️  Warning: Pillow not installed, using original avatar images")
+            return False
+        
+        team_dir = self.assets_dir / "team"
+        sources = {slug: team_dir / candidates[0]
+                   for slug, candidates in self._avatar_index.items()}
+        settings = {key: image_config.get(key, default)
+                    for key, default in AVATAR_IMAGE_DEFAULTS.items()}
+        
+        self._avatar_derivatives, encoded_count, cached_count, failed = build_avatar_derivatives(
+            sources, self.avatar_cache_dir, self.avatars_output_dir, settings, jobs
+        )
+        for slug in failed:
+            print(f"⚠️  Warning: Could not process avatar {sources[slug].name}, using the original")
+        
+        print(f"🖼️  Avatar variants: {encoded_count} photos encoded, {cached_count} from cache")
+        return True
+    
+    def _avatar_fields(self, slug):
+        """Return the avatar URL, srcsets and VCF thumbnail of a member slug."""
+        variants = self._avatar_derivatives.get(slug)
+        if not variants:
+            avatar_path = self._avatar_url(slug)
+            return {
+                'avatar_path': avatar_path,
+                'avatar_srcset': "",
+                'avatar_srcset_webp': "",
+                'avatar_thumbnail': avatar_path,
+            }
+        
+        base_url = f"{self.config['deployment']['base_url']}/avatars"
+        srcsets = {}
+        widths = {}
+        thumbnail = None
+        for variant in variants:
+            url = f"{base_url}/{variant['file']}"
+            if variant['size'] == 'thumb':
+                thumbnail = url
+                continue
+            # Small sources yield several variants of the same width; a
+            # srcset may list each width only once
+            if variant['width'] in widths.setdefault(variant['format'], set()):
+                continue
+            widths[variant['format']].add(variant['width'])
+            srcsets.setdefault(variant['format'], []).append((url, variant['width']))
+        
+        jpeg_variants = srcsets.get('jpeg', [])
+        if jpeg_variants:
+            avatar_path = jpeg_variants[len(jpeg_variants) // 2][0]
+        else:
+            avatar_path = self._avatar_url(slug)
+        
+        return {
+            'avatar_path': avatar_path,
+            'avatar_srcset': ", ".join(f"{url} {width}w" for url, width in jpeg_variants),
+            'avatar_srcset_webp': ", ".join(f"{url} {width}w" for url, width in srcsets.get('webp', [])),
+            'avatar_thumbnail': thumbnail or avatar_path,
+        }
+    
+    def check_avatar_exists(self, first_name, last_name):
+        """Check if avatar image exists in assets/team/ directory."""
+        return self._avatar_url(self.clean_filename(first_name, last_name))
+    
+    def report_avatar_issues(self, member_slugs):
+        """Warn about avatars matching no member and members with several images."""
+        if self._avatar_index is None:
+            self.build_avatar_index()
+        
+        member_slugs = set(member_slugs)
+        for slug, candidates in sorted(self._avatar_index.items()):
+            if slug not in member_slugs:
+                print(f"⚠️  Warning: Avatar matches no team member: {', '.join(candidates)}")
+            elif len(candidates) > 1:
+                print(f"⚠️  Warning: Several avatars for {slug}, using {candidates[0]} "
+                      f"(ignored: {', '.join(candidates[1:])})")
     
     def read_csv_data(self):
         """Read team data from CSV file."""
+        return list(self.iter_csv_data())
+    
+    def iter_csv_data(self):
+        """Yield team data rows from the CSV file one at a time."""
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                return list(reader)
+            f = open(self.csv_file, 'r', encoding='utf-8', newline='')
         except FileNotFoundError:
             raise FileNotFoundError(f"CSV file not found: {self.csv_file}")
+        
+        with f:
+            yield from csv.DictReader(f)
     
     def validate_member_data(self, member_data, row_num):
         """Validate and prepare member data."""
@@ -173,58 +616,87 @@ class ContactCardSiteGenerator:
         return member_data
     
     def prepare_member_data(self, member_data):
-        """Prepare member data with computed fields for templates."""
-        prepared = member_data.copy()
-        
-        # Generate filename
-        prepared['filename'] = self.clean_filename(
-            member_data['first_name'], 
-            member_data['last_name']
-        )
-        
-        # Phone formatting
-        prepared['phone_formatted'] = self.format_phone(member_data['phone'])
-        prepared['phone_clean'] = self.get_phone_clean(member_data['phone'])
-        
-        # Avatar path (now returns absolute URL)
-        prepared['avatar_path'] = self.check_avatar_exists(
-            member_data['first_name'], 
-            member_data['last_name']
-        )
+        """Prepare member data with computed fields for templates.
+
+        Returns a ``PreparedMember``; prepare each row once and pass the
+        record to the output stages instead of the raw CSV dict.
+        """
+        first_name = member_data['first_name']
+        last_name = member_data['last_name']
+        phone = member_data.get('phone', '')
+        filename = self.clean_filename(first_name, last_name)
         
         # Ensure Twitter handle format
         twitter = member_data.get('twitter_handle', '').strip()
         if twitter and not twitter.startswith('@'):
-            prepared['twitter_handle'] = f"@{twitter}"
-        
-        return prepared
+            twitter = f"@{twitter}"
+        
+        return PreparedMember(
+            first_name=first_name,
+            last_name=last_name,
+            title=member_data.get('title', ''),
+            company_name=member_data.get('company_name', ''),
+            phone=phone,
+            email=member_data['email'],
+            linkedin_url=member_data.get('linkedin_url', ''),
+            twitter_handle=twitter,
+            # Generate filename
+            filename=filename,
+            # Phone formatting
+            phone_formatted=self.format_phone(phone),
+            phone_clean=self.get_phone_clean(phone),
+            # Avatar URLs (absolute), resized variants when available
+            **self._avatar_fields(filename)
+        )
+    
+    def iter_prepared_members(self, rows):
+        """Validate and prepare rows lazily, yielding PreparedMember records."""
+        for i, row in enumerate(rows, 1):
+            validated_member = self.validate_member_data(row, i)
+            if not validated_member:
+                continue
+            
+            try:
+                yield self.prepare_member_data(validated_member)
+            except Exception as e:
+                print(f"❌ Error processing {validated_member['first_name']} {validated_member['last_name']}: {e}")
+    
+    def _as_prepared(self, member):
+        """Accept either a PreparedMember or a validated CSV row."""
+        if isinstance(member, PreparedMember):
+            return member
+        return self.prepare_member_data(member)
     
-    def generate_contact_card(self, member_data, cache_buster):
+    def render_contact_card(self, member):
+        """Return the (minified) contact card HTML of a prepared member.
+
+        Shared by the static build and the card server (card_server.py).
+        """
+        template = self.get_template('contact-card.html')
+        return self.minify_html(template.render(
+            member=member,
+            config=self.config
+        ))
+    
+    def generate_contact_card(self, member):
         """Generate HTML contact card for a single member."""
-        template = self.jinja_env.get_template('contact-card.html')
-        
-        prepared_member = self.prepare_member_data(member_data)
-        
-        html_content = template.render(
-            member=prepared_member,
-            config=self.config,
-            cache_buster=cache_buster
-        )
+        prepared_member = self._as_prepared(member)
+        html_content = self.render_contact_card(prepared_member)
         
         # Write HTML file
-        filename = prepared_member['filename']
+        filename = prepared_member.filename
         html_file = self.html_output_dir / f"{filename}.html"
         with open(html_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
         return filename
     
-    def generate_vcf_file(self, member_data):
+    def generate_vcf_file(self, member):
         """Generate VCF file for a member."""
-        prepared_member = self.prepare_member_data(member_data)
-        filename = prepared_member['filename']
+        prepared_member = self._as_prepared(member)
+        filename = prepared_member.filename
         
-        vcf_content = self._build_vcf_content(prepared_member)
+        vcf_content = self.render_vcf(prepared_member)
         
         # Write VCF file
         vcf_file = self.vcf_output_dir / f"{filename}.vcf"
@@ -233,146 +705,412 @@ class ContactCardSiteGenerator:
         
         return filename
     
-    def _build_vcf_content(self, member):
-        """Build VCF content for a member."""
-        vcf_lines = [
-            "BEGIN:VCARD",
-            "VERSION:3.0",
-            f"FN:{member['first_name']} {member['last_name']}",
-            f"N:{member['last_name']};{member['first_name']};;;"
-        ]
-        
-        if member['title']:
-            vcf_lines.append(f"TITLE:{member['title']}")
-        
-        if member['company_name']:
-            vcf_lines.append(f"ORG:{member['company_name']}")
-        
-        if member['phone']:
-            vcf_lines.append(f"TEL;TYPE=WORK,VOICE:{member['phone_clean']}")
-        
-        if member['email']:
-            vcf_lines.append(f"EMAIL;TYPE=WORK:{member['email']}")
-        
-        if member['linkedin_url']:
-            vcf_lines.append(f"URL;TYPE=LinkedIn:{member['linkedin_url']}")
-        
-        if member['twitter_handle']:
-            twitter_url = f"https://twitter.com/{member['twitter_handle'].lstrip('@')}"
-            vcf_lines.append(f"URL;TYPE=Twitter:{twitter_url}")
-        
-        # Add avatar if exists (already absolute URL)
-        if member['avatar_path']:
-            vcf_lines.append(f"PHOTO;VALUE=URL:{member['avatar_path']}")
-        
-        vcf_lines.append("END:VCARD")
-        return '\n'.join(vcf_lines)
+    def open_vcf_exports(self):
+        """Return a VcfExports for this build, or None when disabled.
+
+        Configured by ``vcf_exports``: ``enabled``, ``split_by`` (member
+        fields such as ``title`` or ``company_name``) and ``gzip``.
+        """
+        export_config = self.config.get('vcf_exports', {})
+        if not export_config.get('enabled', True):
+            return None
+        return VcfExports(self.vcf_exports_dir,
+                          split_by=export_config.get('split_by', []),
+                          gzip_variants=export_config.get('gzip', False))
     
-    def generate_index_page(self, team_members, cache_buster):
-        """Generate the main index.html page."""
-        template = self.jinja_env.get_template('index.html')
-        
-        # Prepare team members data
-        prepared_members = [self.prepare_member_data(member) for member in team_members]
-        
-        html_content = template.render(
-            team_members=prepared_members,
-            config=self.config,
-            cache_buster=cache_buster
+    def vcard_contact(self, member):
+        """Return the VCardContact of a prepared member."""
+        urls = []
+        if member.linkedin_url:
+            urls.append(('LinkedIn', member.linkedin_url))
+        if member.twitter_handle:
+            urls.append(('Twitter', f"https://twitter.com/{member.twitter_handle.lstrip('@')}"))
+        
+        return VCardContact(
+            first_name=member.first_name,
+            last_name=member.last_name,
+            title=member.title,
+            organization=member.company_name,
+            phone=member.phone_clean if member.phone else '',
+            email=member.email,
+            urls=urls,
+            # Avatar URLs are absolute; the small thumbnail is preferred
+            photo_url=(member.avatar_thumbnail or member.avatar_path) if member.avatar_path else '',
         )
+    
+    def render_vcf(self, member):
+        """Build VCF content for a member (vCard ``vcard.version``, default 3.0)."""
+        version = self.config.get('vcard', {}).get('version', '3.0')
+        return serialize_vcard(self.vcard_contact(member), version)
+    
+    def generate_index_page(self, team_members, vcf_exports=()):
+        """Generate the main index.html page.
+
+        Only the first ``index.first_page_size`` members are rendered into
+        the page. The rest are written as JSON chunks of ``index.page_size``
+        members to the index chunks directory, which the page fetches as the
+        visitor scrolls. A ``page_size`` of 0 renders everyone in one page.
+        ``vcf_exports`` (as returned by VcfExports.close) are linked as
+        downloads.
+        """
+        index_pages = IndexPages(self)
+        for member in team_members:
+            # PreparedMember and MemberSummary records are used as they are
+            index_pages.add(self.prepare_member_data(member) if isinstance(member, dict) else member)
+        return self.write_index_page(index_pages.first_page, index_pages.close(), vcf_exports)
+    
+    def write_index_page(self, first_page, chunk_count, vcf_exports=()):
+        """Write index.html from its first page of members (see IndexPages).
+
+        Returns ``chunk_count``.
+        """
+        context = self.index_context(first_page, chunk_count, vcf_exports)
         
-        # Write index file
+        # Stream the rendered page to disk instead of building it in memory,
+        # unless it has to be minified as a whole
         index_file = self.output_dir / "index.html"
         with open(index_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            if self.config.get('minify', {}).get('html', False):
+                f.write(self.render_index_page(context))
+            else:
+                self.get_template('index.html').stream(**context).dump(f)
         
-        print(f"📄 Generated: index.html")
+        if chunk_count:
+            print(f"📄 Generated: index.html (+ {chunk_count} member chunks)")
+        else:
+            print(f"📄 Generated: index.html")
+        return chunk_count
     
-    def check_apple_wallet_requirements(self):
-        """Check if Apple Wallet generation requirements are met."""
-        requirements_met = {
-            'certificates': False,
-            'assets': False,
-            'script': False
+    def index_page_sizes(self):
+        """Return ``(first_page_size, page_size)`` of the index (``index`` config)."""
+        index_config = self.config.get('index', {})
+        page_size = index_config.get('page_size', 0)
+        return index_config.get('first_page_size', page_size), page_size
+    
+    def url_path(self, directory):
+        """URL of an output directory relative to the site root, e.g. 'members'."""
+        return os.path.relpath(directory, self.output_dir).replace(os.sep, '/')
+    
+    def index_context(self, first_page, chunk_count, vcf_exports=()):
+        """Template context of the index page.
+
+        ``first_page`` holds the members rendered into the page and
+        ``vcf_exports`` the bulk exports to link (as returned by
+        VcfExports.close).
+        """
+        chunks_url = self.url_path(self.index_chunks_dir)
+        exports_url = self.url_path(self.vcf_exports_dir)
+        return {
+            'team_members': first_page,
+            'chunk_url': f"{chunks_url}/page-{{n}}.json",
+            'chunk_count': chunk_count,
+            'vcf_exports': [
+                dict(export,
+                     url=f"{exports_url}/{export['path']}",
+                     gzip_url=f"{exports_url}/{export['gzip_path']}" if export['gzip_path'] else None)
+                for export in vcf_exports
+            ],
+            'config': self.config,
         }
-        
-        # Check certificates
-        cert_path = self.base_dir / "certs" / "YourPassTypeID.p12"
-        wwdr_path = self.base_dir / "certs" / "WWDR.pem"
-        requirements_met['certificates'] = cert_path.exists() and wwdr_path.exists()
-        
-        # Check assets
-        assets_dir = self.base_dir / "assets" / "images"
-        required_assets = ["icon.png", "icon@2x.png", "logo.png", "logo@2x.png"]
-        requirements_met['assets'] = assets_dir.exists() and all(
-            (assets_dir / asset).exists() for asset in required_assets
+    
+    def render_index_page(self, context):
+        """Return the (minified) index page HTML of an ``index_context``."""
+        return self.minify_html(self.get_template('index.html').render(**context))
+    
+    def render_index_chunk(self, members):
+        """Return one index chunk as compact JSON.
+
+        A list of ``[first_name, last_name, title, filename]`` arrays, which
+        the index page fetches as the visitor scrolls.
+        """
+        return json.dumps([[m.first_name, m.last_name, m.title, m.filename] for m in members],
+                          ensure_ascii=False, separators=(',', ':'))
+    
+    def render_member(self, member):
+        """Render the contact card and VCF of one prepared member.
+
+        Errors are captured in the result instead of raised so a single bad
+        row does not abort a batch running on a worker pool.
+        """
+        result = {
+            'filename': member.filename,
+            'name': member.full_name,
+            'has_avatar': member.avatar_path is not None,
+            'bytes': 0,
+            'error': None,
+        }
+        try:
+            self.generate_contact_card(member)
+            self.generate_vcf_file(member)
+            result['bytes'] = ((self.html_output_dir / f"{member.filename}.html").stat().st_size +
+                               (self.vcf_output_dir / f"{member.filename}.vcf").stat().st_size)
+        except Exception as e:
+            result['error'] = str(e)
+        return result
+
+    def render_members(self, members, jobs=1):
+        """Render members in order, optionally split across worker processes.
+
+        ``members`` may be any iterable, including a generator; it is consumed
+        lazily. Each worker builds its own generator (and Jinja environment)
+        once in its initializer. Members are submitted in chunks of
+        ``RENDER_CHUNK_SIZE`` with a bounded number of chunks in flight, so
+        memory stays flat and the workers keep rendering while this process
+        reads and prepares the next members. Results are yielded back in
+        the original order.
+        """
+        members = iter(members)
+        if jobs <= 1:
+            for member in members:
+                yield self.render_member(member)
+            return
+        
+        chunk = list(itertools.islice(members, RENDER_CHUNK_SIZE))
+        if len(chunk) < 2:
+            for member in chunk:
+                yield self.render_member(member)
+            return
+        
+        print(f"⚙️  Rendering contact cards with {jobs} workers")
+        max_in_flight = jobs * RENDER_CHUNKS_IN_FLIGHT_PER_WORKER
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 initializer=_init_render_worker,
+                                 initargs=(str(self.base_dir), self.asset_manifest)) as executor:
+            while chunk:
+                in_flight.append(executor.submit(_render_members_in_worker, chunk))
+                # Only wait for the oldest chunk once the pipeline is full
+                while len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+                chunk = list(itertools.islice(members, RENDER_CHUNK_SIZE))
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    def precompress_output(self, jobs=1):
+        """Write .gz/.br siblings for the text-like files in the output dir.
+
+        Formats and file extensions come from ``precompress`` in the config.
+        Files with up-to-date siblings are skipped. Prints the byte savings
+        per file type and returns the report.
+        """
+        precompress_config = self.config.get('precompress', {})
+        formats = precompress_config.get('formats', ['gzip', 'brotli'])
+        extensions = precompress_config.get('extensions', PRECOMPRESS_EXTENSIONS)
+        
+        if 'brotli' in formats and not brotli_available():
+            print("⚠️  Warning: brotli not installed, writing gzip sidecars only")
+        
+        report = precompress_tree(self.output_dir, formats, extensions, jobs)
+        
+        compressed = sum(entry['compressed'] for entry in report.values())
+        files = sum(entry['files'] for entry in report.values())
+        print(f"🗜️  Precompressed {compressed} files ({files - compressed} up to date)")
+        for extension, entry in sorted(report.items()):
+            savings = ", ".join(
+                f"{fmt} -{100 - 100 * entry[fmt] / entry['bytes']:.0f}%"
+                for fmt in formats if fmt in entry and entry['bytes']
+            )
+            print(f"   {extension:<6} {entry['files']:>6} files  {entry['bytes']:>10,} bytes  {savings}")
+        return report
+
+    def _hash_bytes(self, data):
+        """Return the SHA-256 hex digest of raw bytes."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _hash_file(self, path):
+        """Return the SHA-256 hex digest of a file, or None if it is missing."""
+        try:
+            return self._hash_bytes(Path(path).read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def _hash_member(self, prepared_member):
+        """Hash the prepared template data of a single member (raw SHA-256 digest)."""
+        payload = json.dumps(prepared_member.to_dict(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).digest()
+
+    def hash_global_inputs(self):
+        """Hash the inputs the generated pages depend on.
+
+        A change to config.json, base.html or a fingerprinted asset
+        invalidates all outputs, since each page embeds their content or
+        fingerprinted URLs; ``contact-card.html`` (and the vCard serializer)
+        only feed the cards and ``index.html`` only the index page.
+        """
+        inputs = {
+            'config.json': self.base_dir / "config.json",
+            'base.html': self.templates_dir / "base.html",
+            'contact-card.html': self.templates_dir / "contact-card.html",
+            'index.html': self.templates_dir / "index.html",
+        }
+        hashes = {name: self._hash_file(path) for name, path in inputs.items()}
+        hashes['asset-manifest'] = self._hash_bytes(
+            json.dumps(self.asset_manifest, sort_keys=True).encode('utf-8')
         )
+        hashes['vcard'] = self._hash_bytes(f"vcard-serializer:{VCARD_SERIALIZER_VERSION}".encode('utf-8'))
+        return hashes
+
+    def load_build_manifest(self):
+        """Load the build manifest from the previous run, if any."""
+        try:
+            with open(self.build_manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            print("⚠️  Warning: Build manifest is corrupt, doing a full rebuild")
+            return {}
+
+    def save_build_manifest(self, manifest):
+        """Persist the build manifest for the next incremental run."""
+        self.build_manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.build_manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.build_manifest_file)
+
+    def remove_stale_outputs(self, current_filenames):
+        """Delete HTML and VCF files of members not produced by this build.
+
+        The output directories are scanned, like the wallet passes are, so
+        cards left behind by any earlier build are found even without a
+        build manifest (fresh clone, CI, deleted .build/). Precompressed
+        siblings go with them. ``current_filenames`` is any container of
+        this build's member filenames, e.g. the MemberManifest. Returns the
+        number of members whose outputs were removed.
+        """
+        sidecar_suffixes = tuple(SIDECAR_SUFFIXES.values())
+        stale_filenames = set()
+        for directory, suffix in ((self.html_output_dir, '.html'), (self.vcf_output_dir, '.vcf')):
+            if not directory.exists():
+                continue
+            for entry in os.scandir(directory):
+                name = entry.name
+                if name.endswith(sidecar_suffixes):
+                    name = name.rsplit('.', 1)[0]
+                if not name.endswith(suffix) or not entry.is_file():
+                    continue
+                filename = name[:-len(suffix)]
+                if filename not in current_filenames:
+                    os.remove(entry.path)
+                    stale_filenames.add(filename)
+        if stale_filenames:
+            print(f"🗑️  Removed the cards of {len(stale_filenames)} members no longer in the CSV")
+        return len(stale_filenames)
+
+    def _member_outputs_exist(self, filename):
+        """Check that both output files of a member are still on disk."""
+        return ((self.html_output_dir / f"{filename}.html").exists() and
+                (self.vcf_output_dir / f"{filename}.vcf").exists())
+
+    def check_apple_wallet_requirements(self):
+        """Check if Apple Wallet generation requirements are met."""
+        return check_wallet_requirements(self.base_dir, wallet_settings(self.config))
+    
+    def open_wallet_passes(self, force=False, jobs=1):
+        """Load the signing certificate for building passes during this run.
+
+        Returns a WalletPasses that members are added to as they stream
+        through the build (changed passes are signed with ``jobs`` workers
+        as they come in), or None when the requirements are not met; the
+        reasons are kept in ``self.wallet_issues`` and printed by
+        ``finish_wallet_passes``.
+        """
+        self.wallet_issues = []
+        try:
+            settings = wallet_settings(self.config)
+        except ValueError as e:
+            self.wallet_issues.append(str(e))
+            return None
+        requirements = check_wallet_requirements(self.base_dir, settings)
+        if not requirements['cryptography']:
+            self.wallet_issues.append("Missing: the cryptography package (pip install -r requirements.txt)")
+        if not requirements['certificates']:
+            self.wallet_issues.append("Missing: Apple Developer certificates in certs/ directory")
+        if not requirements['assets']:
+            self.wallet_issues.append("Missing: Required assets (icon.png, logo.png, etc.) in assets/images/")
+        if self.wallet_issues:
+            return None
         
-        # Check script
-        wallet_script = self.base_dir / "create_wallet_passes_working.py"
-        requirements_met['script'] = wallet_script.exists()
-        
-        return requirements_met
+        try:
+            return WalletPasses(self.base_dir, self.signed_passes_dir, settings, force=force, jobs=jobs)
+        except (ValueError, OSError) as e:
+            self.wallet_issues.append(f"Could not load signing certificates: {e}")
+            return None
     
-    def generate_apple_wallet_passes(self):
-        """Generate Apple Wallet passes by running the wallet script."""
+    def finish_wallet_passes(self, wallet_passes):
+        """Build the last changed passes of a WalletPasses and sync them to output/passes/.
+
+        Returns the report of ``WalletPasses.close``, or None when no
+        passes could be built.
+        """
         print("\n🍎 Generating Apple Wallet passes...")
         print("─" * 50)
         
-        # Check requirements
-        requirements = self.check_apple_wallet_requirements()
-        
-        if not all(requirements.values()):
+        if wallet_passes is None:
             print("⚠️  Apple Wallet requirements not met:")
-            if not requirements['certificates']:
-                print("   Missing: Apple Developer certificates in certs/ directory")
-            if not requirements['assets']:
-                print("   Missing: Required assets (icon.png, logo.png, etc.) in assets/images/")
-            if not requirements['script']:
-                print("   Missing: create_wallet_passes_working.py script")
+            for issue in self.wallet_issues:
+                print(f"   {issue}")
             print("   Skipping wallet pass generation...")
-            return False
-        
-        # Run the wallet pass generation script
-        wallet_script = self.base_dir / "create_wallet_passes_working.py"
+            return None
         
-        try:
-            # Change to base directory to run the script
-            original_dir = Path.cwd()
-            
-            try:
-                # Change to the project root directory
-                import os
-                os.chdir(self.base_dir)
-                
-                # Run the wallet script
-                result = subprocess.run(
-                    [sys.executable, str(wallet_script)], 
-                    capture_output=True, 
-                    text=True,
-                    cwd=str(self.base_dir)
-                )
-                
-                if result.returncode == 0:
-                    print("✅ Apple Wallet passes generated successfully")
-                    
-                    # Copy passes to output directory
-                    return self.copy_passes_to_output()
-                else:
-                    print(f"❌ Apple Wallet generation failed:")
-                    print(f"   Error: {result.stderr}")
-                    return False
-                    
-            finally:
-                # Always return to original directory
-                os.chdir(original_dir)
-                
-        except Exception as e:
-            print(f"❌ Error running Apple Wallet script: {e}")
-            return False
+        for asset in wallet_passes.missing_assets:
+            print(f"   ⚠️  Warning: {asset} not found in assets/images")
+        if wallet_passes.jobs > 1:
+            print(f"⚙️  Building passes with {wallet_passes.jobs} workers")
+        
+        report = wallet_passes.close()
+        for result in report['failed']:
+            print(f"   ❌ {result['name']}: {result['error']}")
+        print(f"✅ Wallet passes: {report['built']} built, {report['skipped']} unchanged, "
+              f"{len(report['failed'])} failed")
+        if report['removed']:
+            print(f"🗑️  Removed {len(report['removed'])} passes of members no longer in the roster")
+        if report['built']:
+            print(f"⏱️  {report['built']} passes in {report['seconds']:.2f}s "
+                  f"({report['built'] / report['seconds'] if report['seconds'] else 0:,.0f} passes/s)")
+        if report['qr_versions']:
+            print("🔳 QR versions: " + ", ".join(f"v{version or '>40'} × {count}"
+                                                for version, count in report['qr_versions'].items()))
+        reduced = [entry for entry in report['qr'] if entry['kind'] != 'vcard']
+        for entry in reduced[:10]:
+            print(f"   ↘️  {entry['name']}: QR payload {entry['kind']} "
+                  f"({entry['bytes']} bytes, version {entry['version']})")
+        if len(reduced) > 10:
+            print(f"   ... and {len(reduced) - 10} more reduced QR payloads (see the build report)")
+        self._report_info['wallet_qr'] = report['qr']
+        
+        if not self.copy_passes_to_output():
+            return None
+        return report
+    
+    def generate_apple_wallet_passes(self, members, jobs=1, force=False):
+        """Build the Apple Wallet passes of prepared members (see finish_wallet_passes).
+
+        Used without a site build; its own stats replace ``self.stats`` and
+        are meant for the wallet report (``write_build_report(self.wallet_report_file)``).
+        """
+        self.stats = BuildStats()
+        self._report_info = {'force': force, 'jobs': jobs}
+        with self.stats.stage('wallet') as counters:
+            wallet_passes = self.open_wallet_passes(force, jobs)
+            if wallet_passes is not None:
+                for member in members:
+                    wallet_passes.add(member)
+            report = self.finish_wallet_passes(wallet_passes)
+            if report is not None:
+                counters.update(built=report['built'], unchanged=report['skipped'],
+                                failed=len(report['failed']), removed=len(report['removed']))
+        self.stats.finish()
+        self._report_info['success'] = report is not None
+        return report
     
     def copy_passes_to_output(self):
-        """Copy generated wallet passes from signed_passes/ to output/passes/."""
+        """Sync generated wallet passes from signed_passes/ to output/passes/.
+
+        Passes whose copy already matches (same size and modification time)
+        are left alone, and passes no longer in signed_passes/ are removed.
+        """
         if not self.signed_passes_dir.exists():
             print("❌ signed_passes directory not found")
             return False
@@ -384,97 +1122,291 @@ class ContactCardSiteGenerator:
             print("⚠️  No .pkpass files found in signed_passes directory")
             return False
         
-        # Copy each .pkpass file to output/passes/
+        self.passes_output_dir.mkdir(parents=True, exist_ok=True)
         copied_count = 0
+        unchanged_count = 0
         for pkpass_file in pkpass_files:
             destination = self.passes_output_dir / pkpass_file.name
             try:
+                source_stat = pkpass_file.stat()
+                try:
+                    target_stat = destination.stat()
+                except FileNotFoundError:
+                    target_stat = None
+                if (target_stat is not None and target_stat.st_size == source_stat.st_size
+                        and target_stat.st_mtime_ns == source_stat.st_mtime_ns):
+                    unchanged_count += 1
+                    continue
                 shutil.copy2(pkpass_file, destination)
                 copied_count += 1
-                print(f"📱 Copied: {pkpass_file.name}")
             except Exception as e:
                 print(f"❌ Failed to copy {pkpass_file.name}: {e}")
         
-        if copied_count > 0:
-            print(f"✅ Successfully copied {copied_count} wallet passes to output/passes/")
+        current = {pkpass_file.name for pkpass_file in pkpass_files}
+        removed_count = 0
+        for stale in self.passes_output_dir.glob("*.pkpass"):
+            if stale.name not in current:
+                stale.unlink()
+                removed_count += 1
+        
+        if copied_count or unchanged_count:
+            print(f"✅ Wallet passes in output/passes/: {copied_count} copied, "
+                  f"{unchanged_count} unchanged, {removed_count} removed")
             return True
         else:
             print("❌ No wallet passes were copied")
             return False
     
-    def generate_all(self):
-        """Generate all HTML and VCF files from CSV data, plus Apple Wallet passes."""
+    def generate_all(self, force=False, jobs=1, precompress=None, wallet=True):
+        """Generate all HTML and VCF files from CSV data, plus Apple Wallet passes.
+
+        Unless ``force`` is set or ``incremental_builds`` is disabled in the
+        config, only members whose prepared data changed since the last run
+        (as recorded in the build manifest) are re-rendered. With ``jobs``
+        above 1 the rendering is spread over that many worker processes.
+        ``precompress`` (default: ``precompress.enabled`` in the config)
+        writes gzip/Brotli siblings of the output at the end. ``wallet=False``
+        skips the Apple Wallet passes.
+
+        Wall/CPU time and counters of every stage are collected in
+        ``self.stats`` and written to the build report
+        (``paths.build_report``, next to output/) even when the build fails.
+        """
+        self.stats = BuildStats()
+        self._report_info = {'force': force, 'jobs': jobs, 'success': False}
+        try:
+            success = self._generate_all(force, jobs, precompress, wallet)
+            self._report_info['success'] = success
+            return success
+        finally:
+            self.stats.finish()
+            self.write_build_report()
+    
+    def write_build_report(self, path=None, **extra):
+        """Write the stats of the last build (plus ``extra`` keys) as JSON.
+
+        ``path`` defaults to the build report (``paths.build_report``).
+        """
+        path = Path(path) if path is not None else self.build_report_file
+        self._report_info.update(extra)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats.write(path, **self._report_info)
+    
+    def _generate_all(self, force, jobs, precompress, wallet):
+        """The build steps of generate_all, timed stage by stage."""
+        stats = self.stats
         print("🚀 Starting Digital Contact Cards Site Generation...")
         print("=" * 60)
         
         # Copy assets to output directory first
-        self.copy_assets_to_output()
+        with stats.stage('assets') as counters:
+            self.copy_assets_to_output()
+            counters.update(self.asset_sync_stats)
         
-        # Read CSV data
+        # Open the CSV as a stream of rows; nothing is loaded up front
+        rows = self.iter_csv_data()
         try:
-            csv_data = self.read_csv_data()
+            first_row = next(rows)
         except FileNotFoundError as e:
             print(f"❌ Error: {e}")
             return False
-        
-        if not csv_data:
+        except StopIteration:
             print("❌ Error: No data found in CSV file")
             return False
-        
-        print(f"📊 Found {len(csv_data)} team members in CSV")
-        
-        # Generate cache buster if enabled
-        cache_buster = str(int(time.time())) if self.config.get('cache_busting') else ""
-        
-        # Process each team member
-        valid_members = []
-        generated_count = 0
-        
-        for i, member in enumerate(csv_data, 1):
-            # Validate member data
-            validated_member = self.validate_member_data(member, i)
-            if not validated_member:
-                continue
+        rows = itertools.chain([first_row], rows)
+        
+        # Scan the avatar directory once for the whole build and create the
+        # resized avatar variants the cards reference
+        with stats.stage('avatars') as counters:
+            self.build_avatar_index()
+            self.generate_avatar_derivatives(jobs)
+            counters['avatars'] = len(self._avatar_index)
+            counters['with_variants'] = len(self._avatar_derivatives)
+        
+        # Load the previous build manifest; a change to the shared inputs
+        # (templates, config, stylesheet) forces a full rebuild of the pages
+        # depending on them
+        with stats.stage('manifest'):
+            incremental = self.config.get('incremental_builds', True) and not force
+            manifest = self.load_build_manifest() if incremental else {}
+            global_hashes = self.hash_global_inputs()
+            previous_globals = manifest.get('globals') or {}
+            changed_globals = {name for name, digest in global_hashes.items()
+                               if previous_globals.get(name) != digest}
+            full_rebuild = bool(changed_globals - {'index.html'})
+            index_rebuild = bool(changed_globals - {'contact-card.html', 'vcard'})
+            # Member digests live on disk and are looked up one at a time
+            member_manifest = MemberManifest(self.member_manifest_file)
+        
+        if incremental and not full_rebuild:
+            print("♻️  Incremental build: only changed members will be regenerated")
+        
+        # Rows flow through validate -> prepare -> hash -> render one at a
+        # time. Digests go to the member manifest and index entries past the
+        # first page to JSON chunks as they come, so nothing grows with the
+        # roster in memory
+        index_pages = IndexPages(self)
+        avatar_members = set()
+        index_digest = hashlib.sha256()
+        vcf_exports = self.open_vcf_exports()
+        wallet_passes = self.open_wallet_passes(force, jobs) if wallet else None
+        
+        with stats.stage('members') as counters:
+            counters.update(rows=0, valid=0, unchanged=0, rendered=0, with_avatar=0,
+                            errors=0, bytes_written=0)
             
-            valid_members.append(validated_member)
+            def counted_rows():
+                for row in rows:
+                    counters['rows'] += 1
+                    yield row
             
-            try:
-                # Generate contact card and VCF
-                filename = self.generate_contact_card(validated_member, cache_buster)
-                self.generate_vcf_file(validated_member)
-                
-                # Check avatar status
-                prepared = self.prepare_member_data(validated_member)
-                avatar_status = "✅ with avatar" if prepared['avatar_path'] else "📷 no avatar"
-                
-                print(f"{avatar_status} Generated: {filename}.html and {filename}.vcf")
-                generated_count += 1
-                
-            except Exception as e:
-                print(f"❌ Error processing {validated_member['first_name']} {validated_member['last_name']}: {e}")
-                continue
-        
-        # Generate index page
-        if valid_members:
-            self.generate_index_page(valid_members, cache_buster)
+            def changed_members(prepared_members):
+                for prepared in prepared_members:
+                    entry = prepared.summary()
+                    index_pages.add(entry)
+                    index_digest.update(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+                    
+                    filename = prepared.filename
+                    if filename in self._avatar_index:
+                        avatar_members.add(filename)
+                    member_hash = self._hash_member(prepared)
+                    unchanged = (not full_rebuild and member_manifest.digest(filename) == member_hash
+                                 and self._member_outputs_exist(filename))
+                    member_manifest.record(filename, member_hash)
+                    
+                    if unchanged:
+                        counters['unchanged'] += 1
+                        continue
+                    
+                    yield prepared
+            
+            def exported(prepared_members):
+                # Every member goes into the bulk exports, changed or not
+                for prepared in prepared_members:
+                    vcf_exports.add(prepared, self.render_vcf(prepared))
+                    yield prepared
+            
+            def with_passes(prepared_members):
+                # Passes are digested for every member; changed ones are signed in batches
+                for prepared in prepared_members:
+                    wallet_passes.add(prepared)
+                    yield prepared
+            
+            # Generate contact cards and VCFs, serially or on a worker pool;
+            # results come back in roster order either way. Each step is
+            # timed separately although they run interleaved
+            prepared_members = stats.timed_iter(
+                'prepare', self.iter_prepared_members(stats.timed_iter('csv_read', counted_rows()))
+            )
+            if vcf_exports is not None:
+                prepared_members = stats.timed_iter('vcf_exports', exported(prepared_members))
+            if wallet_passes is not None:
+                prepared_members = stats.timed_iter('wallet_passes', with_passes(prepared_members))
+            to_render = stats.timed_iter('change_detection', changed_members(prepared_members))
+            for result in stats.timed_iter('render', self.render_members(to_render, jobs)):
+                if result['error']:
+                    print(f"❌ Error processing {result['name']}: {result['error']}")
+                    member_manifest.discard(result['filename'])
+                    counters['errors'] += 1
+                    continue
+                counters['rendered'] += 1
+                counters['with_avatar'] += result['has_avatar']
+                counters['bytes_written'] += result['bytes']
+            counters['valid'] = index_pages.count
+            chunk_count = index_pages.close()
+            counters['index_chunks_written'] = index_pages.chunks_written
+        
+        generated_count = counters['rendered']
+        skipped_count = counters['unchanged']
+        print(f"📊 Processed {index_pages.count} valid team members from CSV")
+        if generated_count:
+            print(f"🧾 Generated {generated_count} contact cards and VCFs "
+                  f"({counters['with_avatar']} with avatar, {generated_count - counters['with_avatar']} without)")
+        if skipped_count:
+            print(f"⏭️  Skipped {skipped_count} unchanged contact cards")
+        
+        # Publish the bulk vCard exports written during the member pass
+        published_exports = []
+        if vcf_exports is not None and index_pages.count:
+            with stats.stage('vcf_exports') as counters:
+                published_exports = vcf_exports.close()
+                counters['files'] = len(published_exports)
+                counters['updated'] = sum(export['updated'] for export in published_exports)
+            splits = len(published_exports) - 1
+            print(f"📇 Contact exports: team.vcf with {published_exports[0]['count']} contacts"
+                  + (f" + {splits} split files" if splits > 0 else "")
+                  + f" ({counters['updated']} updated)")
+        index_digest.update(json.dumps([(export['path'], export['label'], export['count'], export['gzip_path'])
+                                        for export in published_exports]).encode('utf-8'))
+        
+        with stats.stage('cleanup') as counters:
+            self.report_avatar_issues(avatar_members)
+            
+            # Remove outputs of members that left the roster
+            counters['removed'] = self.remove_stale_outputs(member_manifest)
+        
+        # Generate index page only when the member list changed
+        with stats.stage('index') as counters:
+            index_hash = index_digest.hexdigest()
+            index_file = self.output_dir / "index.html"
+            counters['generated'] = 0
+            counters['chunks'] = chunk_count
+            if index_pages.count and (index_rebuild or manifest.get('index') != index_hash
+                                      or not index_file.exists()):
+                self.write_index_page(index_pages.first_page, chunk_count, published_exports)
+                counters['generated'] = 1
+                counters['bytes_written'] = index_file.stat().st_size
+        
+        with stats.stage('manifest'):
+            member_manifest.commit()
+            self.save_build_manifest({
+                'version': 3,
+                'globals': global_hashes,
+                'index': index_hash,
+            })
         
         # Generate Apple Wallet passes
-        wallet_success = self.generate_apple_wallet_passes()
+        wallet_success = False
+        if wallet:
+            with stats.stage('wallet') as counters:
+                wallet_report = self.finish_wallet_passes(wallet_passes)
+                wallet_success = wallet_report is not None
+                if wallet_success:
+                    counters.update(built=wallet_report['built'], unchanged=wallet_report['skipped'],
+                                    failed=len(wallet_report['failed']),
+                                    removed=len(wallet_report['removed']))
+        
+        # Precompressed siblings for hosts/CDNs that serve them directly
+        if precompress is None:
+            precompress = self.config.get('precompress', {}).get('enabled', False)
+        if precompress:
+            print()
+            with stats.stage('precompress') as counters:
+                report = self.precompress_output(jobs)
+                counters['files'] = sum(entry['files'] for entry in report.values())
+                counters['compressed'] = sum(entry['compressed'] for entry in report.values())
         
         # Summary
         print("\n" + "=" * 60)
         print(f"🎉 Successfully generated {generated_count} contact cards!")
+        if skipped_count:
+            print(f"♻️  Unchanged (skipped): {skipped_count} contact cards")
         print(f"📁 HTML files: {self.html_output_dir}")
         print(f"📁 VCF files: {self.vcf_output_dir}")
         print(f"🌐 Index page: {self.output_dir}/index.html")
-        print(f"📁 Assets copied to: {self.output_dir}/assets")
+        print(f"📁 Assets synced to: {self.output_dir}/assets")
         
         if wallet_success:
             print(f"📱 Apple Wallet passes: {self.passes_output_dir}")
-        else:
+        elif wallet:
             print("⚠️  Apple Wallet passes: Skipped (requirements not met)")
         
-        if generated_count > 0:
+        print("\n⏱️  Build stages:")
+        for line in stats.summary_lines():
+            print(line)
+        print(f"🧾 Build report: {self.build_report_file}")
+        
+        if generated_count + skipped_count > 0:
             print("\n💡 Next steps:")
             print("1. Review generated files in the output/ directory")
             print("2. Test VCF files on mobile devices")
@@ -484,14 +1416,147 @@ class ContactCardSiteGenerator:
             else:
                 print("3. Deploy to GitHub Pages with: ./deploy.sh")
         
-        return generated_count > 0
+        return generated_count + skipped_count > 0
+    
+    def watched_paths(self):
+        """Files and directories whose changes trigger a rebuild in watch mode."""
+        return [self.base_dir / "config.json", self.csv_file, self.templates_dir, self.assets_dir]
+    
+    def rebuild_changed(self, changed, jobs=1):
+        """Rebuild what a set of changed input files affects (watch mode).
+
+        Template edits reset the Jinja environment (and the loaded
+        templates) before building. Edits limited to assets outside team/
+        only resync the assets; everything else runs an incremental build,
+        which re-renders just the members and pages whose inputs changed.
+        Wallet passes and precompression are skipped.
+        """
+        changed = [Path(path) for path in changed]
+        
+        if any(self.templates_dir in path.parents for path in changed):
+            self._setup_jinja()
+        
+        team_dir = self.assets_dir / "team"
+        assets_only = all(self.assets_dir in path.parents and team_dir not in path.parents
+                          for path in changed)
+        if assets_only and not self.config.get('cache_busting'):
+            return self.copy_assets_to_output()
+        
+        return self.generate_all(jobs=jobs, precompress=False, wallet=False)
 
 
-def main():
+def watch_site(jobs=1, host='127.0.0.1', port=8000):
+    """Rebuild on every input change and serve a live-reloading preview.
+
+    One generator is kept warm for the whole session and only replaced when
+    config.json changes. Asset fingerprinting is turned off while watching,
+    so a stylesheet edit is a plain asset sync instead of re-rendering every
+    card; the next regular build fingerprints the assets again.
+    """
+    def new_generator():
+        generator = ContactCardSiteGenerator()
+        generator.config['cache_busting'] = False
+        return generator
+    
+    generator = new_generator()
+    generator.generate_all(jobs=jobs, precompress=False, wallet=False)
+    
+    notifier = BuildNotifier()
+    server = start_preview_server(generator.output_dir, generator.config['deployment']['base_url'],
+                                  notifier, host, port)
+    print(f"\n👀 Watching for changes; preview at http://{host}:{server.server_port}/ "
+          "(Ctrl+C to stop)")
+    
+    try:
+        for changed in iter_changes(lambda: generator.watched_paths()):
+            start = time.perf_counter()
+            names = ', '.join(sorted(Path(path).name for path in changed))
+            print(f"\n🔁 Changed: {names}")
+            try:
+                if generator.base_dir / "config.json" in {Path(path) for path in changed}:
+                    generator = new_generator()
+                    generator.generate_all(jobs=jobs, precompress=False, wallet=False)
+                else:
+                    generator.rebuild_changed(changed, jobs)
+            except Exception as e:
+                print(f"❌ Rebuild failed: {e}")
+                continue
+            notifier.notify()
+            print(f"✅ Rebuilt in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        server.shutdown()
+    return 0
+
+
+# Per-process generator used by the --jobs worker pool
+_worker_generator = None
+
+
+def _init_render_worker(base_dir, asset_manifest):
+    """Create the generator of a render worker process once at startup."""
+    global _worker_generator
+    _worker_generator = ContactCardSiteGenerator(base_dir)
+    _worker_generator.asset_manifest = asset_manifest
+
+
+def _render_members_in_worker(members):
+    """Render a chunk of prepared members with the worker's generator."""
+    return [_worker_generator.render_member(member) for member in members]
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate the digital contact cards site.")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build manifest and regenerate everything")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="render with N worker processes (0 = one per CPU core)")
+    parser.add_argument('--precompress', action='store_true', default=None,
+                        help="write .gz/.br siblings of the text output files")
+    parser.add_argument('--compile-templates', action='store_true',
+                        help="precompile the templates into Python modules and exit")
+    parser.add_argument('--watch', action='store_true',
+                        help="rebuild on changes and serve a live-reloading preview of output/")
+    parser.add_argument('--profile', nargs='?', const='cpu', choices=PROFILE_MODES,
+                        help="profile the build with cProfile (cpu, the default) or tracemalloc (memory)")
+    parser.add_argument('--port', type=int, default=8000,
+                        help="port of the --watch preview server (default: 8000)")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv=None):
     """Main function to run the site generator."""
+    args = parse_args(argv)
+    if args.watch:
+        return watch_site(jobs=args.jobs, port=args.port)
     try:
         generator = ContactCardSiteGenerator()
-        success = generator.generate_all()
+        if args.compile_templates:
+            target = generator.compile_templates()
+            print(f"📦 Precompiled templates to: {target}")
+            if not generator.config.get('templates', {}).get('precompiled', False):
+                print("   Set templates.precompiled to true in config.json to use them")
+            return 0
+        
+        def build():
+            return generator.generate_all(force=args.force, jobs=args.jobs,
+                                          precompress=args.precompress)
+        
+        if args.profile:
+            suffix = 'pstats' if args.profile == 'cpu' else 'txt'
+            profile_file = generator.build_report_file.with_name(f"build-profile.{suffix}")
+            success, profile_info = profile_call(args.profile, build, profile_file)
+            generator.write_build_report(profile=profile_info)
+            print(f"🔬 Profile saved to: {profile_file}")
+        else:
+            success = build()
         
         if not success:
             print("\n❌ Site generation failed. Please check the error messages above.")
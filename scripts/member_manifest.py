@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Member Build Manifest
+
+Content hashes of every member's rendered inputs, kept in a local SQLite
+database next to the build manifest instead of in memory, so incremental
+builds of very large rosters look members up one at a time and memory
+stays flat however many members there are.
+
+Every build is numbered. Members seen during a build are recorded under
+its number inside one transaction; ``commit()`` drops the rows of members
+that were not seen (they left the roster) and makes the build visible. A
+build that crashes is rolled back, leaving the previous one intact.
+Digests are stored as raw bytes.
+"""
+
+import sqlite3
+from pathlib import Path
+
+
+class MemberManifest:
+    """Per-member digests of the previous build and the one in progress."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS members ("
+            " filename TEXT PRIMARY KEY, digest BLOB, build INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._db.execute("BEGIN")
+        previous = self._db.execute("SELECT MAX(build) FROM members").fetchone()[0]
+        self.build = (previous or 0) + 1
+
+    def digest(self, filename):
+        """Return the digest a member had in the previous build, or None."""
+        row = self._db.execute("SELECT digest FROM members WHERE filename = ?",
+                               (filename,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, filename, digest):
+        """Record a member of this build with the digest of its inputs."""
+        self._db.execute("INSERT OR REPLACE INTO members (filename, digest, build) VALUES (?, ?, ?)",
+                         (filename, digest, self.build))
+
+    def discard(self, filename):
+        """Forget a member's digest, so its outputs are rendered again next time."""
+        self._db.execute("UPDATE members SET digest = NULL WHERE filename = ?", (filename,))
+
+    def __contains__(self, filename):
+        """True if the member was recorded during this build."""
+        return self._db.execute("SELECT 1 FROM members WHERE filename = ? AND build = ?",
+                                (filename, self.build)).fetchone() is not None
+
+    def __len__(self):
+        """Number of members recorded during this build."""
+        return self._db.execute("SELECT COUNT(*) FROM members WHERE build = ?",
+                                (self.build,)).fetchone()[0]
+
+    def commit(self):
+        """Drop members not seen in this build and save it."""
+        self._db.execute("DELETE FROM members WHERE build != ?", (self.build,))
+        self._db.execute("COMMIT")
+        self._db.close()
+
+    def rollback(self):
+        """Discard this build's changes, keeping the previous build."""
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+        self._db.close()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+HTML and CSS Minification
+
+Conservative, dependency-free minifiers for the generated pages and the
+stylesheet. They only remove what cannot change rendering:
+
+- HTML: comments (except conditional comments), indentation and whitespace
+  runs in text, whitespace between attributes. ``<pre>``, ``<textarea>``,
+  ``<script>`` and ``<style>`` contents and quoted attribute values are kept
+  byte for byte. Whitespace-only text next to a block-level tag is dropped,
+  elsewhere it collapses to a single space.
+- CSS: comments, whitespace runs, spaces around ``{ } ; , >`` and after
+  ``:``, and the last ``;`` of a block. Strings are kept as they are.
+
+Stylesheets are cached on disk by input hash, so an unchanged stylesheet is
+never minified twice. Pages are minified directly: they are only rendered
+when they changed, so caching them would just grow the cache.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+# Bump when the minifiers change so cached results are not reused
+MINIFIER_VERSION = "2"
+
+BLOCK_TAGS = frozenset((
+    'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style', 'noscript',
+    'div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'section', 'article', 'header', 'footer', 'nav', 'main', 'aside', 'form',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'br', 'hr', 'source',
+))
+
+_HTML_TOKENS = re.compile(
+    r'(?P<raw><(?P<raw_tag>pre|textarea|script|style)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>.*?</(?P=raw_tag)\s*>)'
+    r'|(?P<comment><!--(?!\[if).*?-->)'
+    r'|(?P<tag><(?:[^>"\']|"[^"]*"|\'[^\']*\')*>)',
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_NAME = re.compile(r'</?\s*([a-zA-Z][a-zA-Z0-9-]*)')
+_TAG_PARTS = re.compile(r'"[^"]*"|\'[^\']*\'|\s+|[^\s"\']+')
+_TAG_END = re.compile(r'\s+(/?>)$')
+_WHITESPACE = re.compile(r'\s+')
+
+_CSS_TOKENS = re.compile(r'(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(?P<comment>/\*.*?\*/)', re.DOTALL)
+_CSS_SPACE_AROUND = re.compile(r'\s*([{};,>])\s*')
+_CSS_SPACE_AFTER_COLON = re.compile(r':\s+')
+
+
+def _tag_name(tag):
+    """Return the lower-case element name of a tag, or ''."""
+    match = _TAG_NAME.match(tag)
+    return match.group(1).lower() if match else ''
+
+
+def _minify_tag(tag):
+    """Collapse whitespace between the attributes of a start or end tag."""
+    parts = []
+    for part in _TAG_PARTS.findall(tag):
+        parts.append(' ' if part.isspace() else part)
+    # Only the space before the closing > or /> goes; quoted values stay as they are
+    return _TAG_END.sub(r'\1', ''.join(parts))
+
+
+def minify_html(html):
+    """Return a minified copy of an HTML document."""
+    pieces = []  # (kind, text, tag name)
+
+    def add_text(text):
+        # Text on both sides of a dropped comment becomes one piece
+        if pieces and pieces[-1][0] == 'text':
+            pieces[-1] = ('text', pieces[-1][1] + text, '')
+        else:
+            pieces.append(('text', text, ''))
+
+    position = 0
+    for match in _HTML_TOKENS.finditer(html):
+        if match.start() > position:
+            add_text(html[position:match.start()])
+        if match.group('raw'):
+            pieces.append(('raw', match.group('raw'), match.group('raw_tag').lower()))
+        elif match.group('tag'):
+            pieces.append(('tag', _minify_tag(match.group('tag')), _tag_name(match.group('tag'))))
+        # Comments are dropped
+        position = match.end()
+    if position < len(html):
+        add_text(html[position:])
+
+    output = []
+    for i, (kind, text, name) in enumerate(pieces):
+        if kind != 'text':
+            output.append(text)
+            continue
+        if text.strip():
+            output.append(_WHITESPACE.sub(' ', text))
+            continue
+        previous_name = pieces[i - 1][2] if i > 0 else 'html'
+        next_name = pieces[i + 1][2] if i + 1 < len(pieces) else 'html'
+        if previous_name in BLOCK_TAGS or next_name in BLOCK_TAGS:
+            continue
+        output.append(' ')
+    return ''.join(output).strip()
+
+
+def minify_css(css):
+    """Return a minified copy of a stylesheet."""
+    output = []
+    position = 0
+
+    def squeeze(chunk):
+        chunk = _WHITESPACE.sub(' ', chunk)
+        chunk = _CSS_SPACE_AROUND.sub(r'\1', chunk)
+        return _CSS_SPACE_AFTER_COLON.sub(':', chunk).replace(';}', '}')
+
+    # Code around dropped comments is squeezed as one piece, strings never
+    pending = []
+    for match in _CSS_TOKENS.finditer(css):
+        pending.append(css[position:match.start()])
+        if match.group('string'):
+            output.append(squeeze(''.join(pending)))
+            output.append(match.group('string'))
+            pending = []
+        position = match.end()
+    pending.append(css[position:])
+    output.append(squeeze(''.join(pending)))
+    return ''.join(output).strip()
+
+
+MINIFIERS = {'html': minify_html, 'css': minify_css}
+
+
+class MinifyCache:
+    """On-disk cache of minified outputs keyed by a hash of the input.
+
+    Meant for inputs that recur between builds (stylesheets); every entry
+    stays until the cache directory is removed.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def minify(self, kind, text):
+        """Minify ``text`` as ``kind`` ('html' or 'css'), using the cache."""
+        key = hashlib.sha256(f"{MINIFIER_VERSION}:{kind}:{text}".encode('utf-8')).hexdigest()
+        cache_file = self.cache_dir / kind / key[:2] / f"{key}.{kind}"
+        try:
+            result = cache_file.read_text(encoding='utf-8')
+            self.hits += 1
+            return result
+        except FileNotFoundError:
+            pass
+
+        result = MINIFIERS[kind](text)
+        self.misses += 1
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread, for the threads of the card server
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(result, encoding='utf-8')
+        os.replace(tmp, cache_file)
+        return result
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Apple Wallet Pass Signing
+
+Creates the detached PKCS#7 signature of a pass's ``manifest.json``
+in-process with ``cryptography``, replacing the three ``openssl`` calls
+per pass (extract certificate, extract key, ``smime -sign``).
+
+The PKCS#12 bundle is decrypted once per run and the private key only
+ever lives in memory; nothing is written next to the pass. The signature
+has the same shape as ``openssl smime -binary -sign -outform DER``:
+DER-encoded, detached, SHA-256, with the signing certificate and the WWDR
+intermediate embedded and the usual signed attributes (content type,
+signing time, message digest, S/MIME capabilities).
+
+Requirements:
+    - cryptography (optional for the site; without it no passes are built)
+"""
+
+from pathlib import Path
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.serialization import pkcs7, pkcs12
+except ImportError:  # cryptography is optional, see cryptography_available()
+    x509 = None
+
+
+def cryptography_available():
+    """Return True if cryptography can be imported."""
+    return x509 is not None
+
+
+def load_certificate(path):
+    """Load an X.509 certificate from a PEM or DER (.cer) file."""
+    data = Path(path).read_bytes()
+    if b'-----BEGIN CERTIFICATE-----' in data:
+        return x509.load_pem_x509_certificate(data)
+    return x509.load_der_x509_certificate(data)
+
+
+class PassSigner:
+    """Signs pass manifests with a pass type certificate loaded once."""
+
+    def __init__(self, certificate_path, certificate_password, wwdr_path):
+        password = certificate_password.encode('utf-8') if certificate_password else None
+        key, certificate, _ = pkcs12.load_key_and_certificates(
+            Path(certificate_path).read_bytes(), password)
+        if key is None or certificate is None:
+            raise ValueError(f"{certificate_path} does not contain a certificate and private key")
+        self.certificate = certificate
+        self.certificate_fingerprint = certificate.fingerprint(hashes.SHA256())
+        self.wwdr_certificate = load_certificate(wwdr_path)
+        self._key = key
+
+    def sign(self, manifest):
+        """Return the DER-encoded detached signature of the manifest bytes."""
+        return (
+            pkcs7.PKCS7SignatureBuilder()
+            .set_data(manifest)
+            .add_signer(self.certificate, self._key, hashes.SHA256())
+            .add_certificate(self.wwdr_certificate)
+            .sign(serialization.Encoding.DER,
+                  [pkcs7.PKCS7Options.DetachedSignature, pkcs7.PKCS7Options.Binary])
+        )
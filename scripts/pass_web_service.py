@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+PassKit Web Service
+
+A small HTTP server implementing the Apple Wallet web service endpoints,
+so passes installed on a device are updated in place instead of being
+downloaded and re-added:
+
+    POST   /v1/devices/<device>/registrations/<pass type>/<serial>   register
+    DELETE /v1/devices/<device>/registrations/<pass type>/<serial>   unregister
+    GET    /v1/devices/<device>/registrations/<pass type>?passesUpdatedSince=<tag>
+                                                     serials updated since a tag
+    GET    /v1/passes/<pass type>/<serial>           latest pass (304 if unchanged)
+    POST   /v1/log                                   device error log
+
+Passes are served from signed_passes/ and looked up in the pass manifest
+written by the wallet builder (``.build/passes.json``), whose ``updated``
+times are the update tags and ``Last-Modified`` dates. Device
+registrations are kept in a local SQLite database. Requests are
+authenticated with the per-pass token the builder embedded in the pass
+(``authenticationToken``), so the service holds no token list.
+
+Passes only point devices here when ``wallet.web_service_url`` is set in
+config.json. Telling devices that a pass changed takes an APNs push to
+the tokens from ``PassStore.push_tokens``; this module does not send
+pushes, and every endpoint can be exercised locally with any HTTP client.
+
+Usage:
+    python scripts/pass_web_service.py [--host 127.0.0.1] [--port 8080]
+"""
+
+import argparse
+import hmac
+import json
+import re
+import sqlite3
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from wallet_passes import authentication_token, load_pass_manifest, wallet_settings
+
+_REGISTRATION_PATH = re.compile(r'^/v1/devices/([^/]+)/registrations/([^/]+)/([^/]+)$')
+_SERIALS_PATH = re.compile(r'^/v1/devices/([^/]+)/registrations/([^/]+)$')
+_PASS_PATH = re.compile(r'^/v1/passes/([^/]+)/([^/]+)$')
+
+
+class PassStore:
+    """Device registrations in a SQLite database."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS registrations ("
+                " device TEXT NOT NULL, pass_type TEXT NOT NULL, serial TEXT NOT NULL,"
+                " push_token TEXT NOT NULL, PRIMARY KEY (device, pass_type, serial))"
+            )
+
+    def _connect(self):
+        # One short-lived connection per call keeps request threads independent
+        return sqlite3.connect(self.path, timeout=10)
+
+    def register(self, device, pass_type, serial, push_token):
+        """Register a pass on a device; returns True if it was not registered yet."""
+        with self._connect() as db:
+            existing = db.execute(
+                "SELECT 1 FROM registrations WHERE device = ? AND pass_type = ? AND serial = ?",
+                (device, pass_type, serial)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO registrations (device, pass_type, serial, push_token)"
+                " VALUES (?, ?, ?, ?)", (device, pass_type, serial, push_token))
+        return existing is None
+
+    def unregister(self, device, pass_type, serial):
+        """Remove a registration; returns True if there was one."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "DELETE FROM registrations WHERE device = ? AND pass_type = ? AND serial = ?",
+                (device, pass_type, serial))
+        return cursor.rowcount > 0
+
+    def serials(self, device, pass_type):
+        """Serial numbers of the passes registered on a device."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT serial FROM registrations WHERE device = ? AND pass_type = ?",
+                (device, pass_type)).fetchall()
+        return [serial for serial, in rows]
+
+    def push_tokens(self, pass_type, serials):
+        """Push tokens of the devices holding any of the given passes."""
+        serials = list(serials)
+        if not serials:
+            return set()
+        placeholders = ", ".join("?" * len(serials))
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT DISTINCT push_token FROM registrations"
+                f" WHERE pass_type = ? AND serial IN ({placeholders})",
+                [pass_type] + serials).fetchall()
+        return {token for token, in rows}
+
+
+class PassIndex:
+    """Serial number -> (pass file, updated time) from the pass manifest.
+
+    The manifest is re-read whenever the wallet builder rewrites it, so a
+    running service picks up new builds without a restart.
+    """
+
+    def __init__(self, manifest_file, passes_dir):
+        self.manifest_file = Path(manifest_file)
+        self.passes_dir = Path(passes_dir)
+        self._mtime = None
+        self._passes = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = self.manifest_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime != self._mtime:
+                self._passes = {
+                    entry['serial']: (self.passes_dir / f"{filename}.pkpass", entry['updated'])
+                    for filename, entry in load_pass_manifest(self.manifest_file).items()
+                }
+                self._mtime = mtime
+            return self._passes
+
+    def get(self, serial):
+        """Return ``(path, updated)`` of a pass, or None."""
+        return self._load().get(serial)
+
+    def updated_since(self, serials, tag):
+        """Serials (of the given ones) updated after tag, and the newest update time."""
+        passes = self._load()
+        updated = [(serial, passes[serial][1]) for serial in serials if serial in passes]
+        changed = [serial for serial, time in updated if tag is None or time > tag]
+        return changed, max((time for _, time in updated), default=tag or 0)
+
+
+class PassWebServiceHandler(BaseHTTPRequestHandler):
+    """Request handler; ``settings``, ``store`` and ``index`` are set on a subclass."""
+
+    settings = None
+    store = None
+    index = None
+    server_version = "PassWebService/1"
+
+    def _send(self, status, body=b"", content_type="application/json", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def _authorized(self, pass_type, serial):
+        header = self.headers.get("Authorization", "")
+        if pass_type != self.settings['pass_type_identifier'] or not header.startswith("ApplePass "):
+            return False
+        expected = authentication_token(serial, self.settings)
+        return hmac.compare_digest(header[len("ApplePass "):].strip(), expected)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path == "/v1/log":
+            data = self._read_json() or {}
+            for message in data.get('logs', []):
+                print(f"📱 Device log: {message}")
+            return self._send(200)
+
+        match = _REGISTRATION_PATH.match(path)
+        if not match:
+            return self._send(404)
+        device, pass_type, serial = match.groups()
+        if not self._authorized(pass_type, serial):
+            return self._send(401)
+        data = self._read_json()
+        if not data or not data.get('pushToken'):
+            return self._send(400)
+        created = self.store.register(device, pass_type, serial, data['pushToken'])
+        self._send(201 if created else 200)
+
+    def do_DELETE(self):
+        match = _REGISTRATION_PATH.match(urlsplit(self.path).path)
+        if not match:
+            return self._send(404)
+        device, pass_type, serial = match.groups()
+        if not self._authorized(pass_type, serial):
+            return self._send(401)
+        self.store.unregister(device, pass_type, serial)
+        self._send(200)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        match = _SERIALS_PATH.match(url.path)
+        if match:
+            return self._serials_updated(*match.groups(), parse_qs(url.query))
+        match = _PASS_PATH.match(url.path)
+        if match:
+            return self._latest_pass(*match.groups())
+        self._send(404)
+
+    def _serials_updated(self, device, pass_type, query):
+        serials = self.store.serials(device, pass_type)
+        if not serials:
+            return self._send(404)
+        try:
+            tag = int(query['passesUpdatedSince'][0]) if 'passesUpdatedSince' in query else None
+        except ValueError:
+            tag = None
+        changed, last_updated = self.index.updated_since(serials, tag)
+        if not changed:
+            return self._send(204)
+        self._send_json(200, {'serialNumbers': changed, 'lastUpdated': str(last_updated)})
+
+    def _latest_pass(self, pass_type, serial):
+        if not self._authorized(pass_type, serial):
+            return self._send(401)
+        entry = self.index.get(serial)
+        if entry is None:
+            return self._send(404)
+        path, updated = entry
+        updated_seconds = updated // 1000
+        headers = [("Last-Modified", formatdate(updated_seconds, usegmt=True)),
+                   ("Cache-Control", "no-cache")]
+
+        since = self.headers.get("If-Modified-Since")
+        if since:
+            try:
+                if updated_seconds <= parsedate_to_datetime(since).timestamp():
+                    return self._send(304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return self._send(404)
+        self._send(200, data, "application/vnd.apple.pkpass", headers)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def create_server(base_dir, config, host='127.0.0.1', port=8080):
+    """Create (but do not start) the web service of a project directory."""
+    base_dir = Path(base_dir)
+    settings = wallet_settings(config)
+    if not settings['web_service_secret']:
+        raise ValueError("The web service needs wallet.web_service_secret "
+                         "(or WALLET_WEB_SERVICE_SECRET) to check authentication tokens")
+    paths = config['paths']
+    handler = type('Handler', (PassWebServiceHandler,), {
+        'settings': settings,
+        'store': PassStore(base_dir / settings['web_service_store']),
+        'index': PassIndex(base_dir / settings['manifest'], base_dir / paths['signed_passes_dir']),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Apple Wallet PassKit web service.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="port to listen on (default: 8080)")
+    args = parser.parse_args(argv)
+
+    base_dir = Path(__file__).resolve().parent.parent
+    with open(base_dir / "config.json", 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    try:
+        server = create_server(base_dir, config, args.host, args.port)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    print(f"🎫 PassKit web service on http://{args.host}:{server.server_address[1]}/v1/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
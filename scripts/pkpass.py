@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+In-Memory .pkpass Builder
+
+Assembles Apple Wallet ``.pkpass`` archives without touching the working
+directory: the pass images are read and SHA-1 hashed once when the builder
+is created, ``pass.json`` and ``manifest.json`` are serialized in memory,
+the manifest is signed by a ``PassSigner`` and the ZIP is written straight
+from those buffers to its destination.
+
+Archive entries carry a fixed timestamp, so two passes with the same
+content differ only in their signature's signing time. ``digest`` hashes
+everything that goes into a pass (``pass.json``, the images and the
+signing certificate) without signing it, which is what incremental
+builds compare to skip unchanged passes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from zipfile import ZipFile, ZipInfo
+
+# Images bundled with every pass (no thumbnail, to keep the front clean)
+PASS_ASSETS = ("icon.png", "icon@2x.png", "logo.png", "logo@2x.png")
+
+# Timestamp of every archive entry (the earliest a ZIP file can store)
+ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class PassBuilder:
+    """Builds and signs .pkpass archives from pass dicts."""
+
+    def __init__(self, assets_dir, signer, asset_names=PASS_ASSETS):
+        self.signer = signer
+        self.assets = {}  # name -> (bytes, sha1 hex)
+        self.missing_assets = []
+        for name in asset_names:
+            path = Path(assets_dir) / name
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                self.missing_assets.append(name)
+                continue
+            self.assets[name] = (data, hashlib.sha1(data).hexdigest())
+
+        # Everything a pass depends on besides its pass.json
+        fingerprint = hashlib.sha256(signer.certificate_fingerprint)
+        for name, (_, sha1) in self.assets.items():
+            fingerprint.update(f"{name}:{sha1}\n".encode('utf-8'))
+        self.fingerprint = fingerprint.digest()
+
+    @staticmethod
+    def serialize(pass_dict):
+        """Return the pass.json bytes of a pass dict."""
+        return json.dumps(pass_dict, indent=2).encode('utf-8')
+
+    def digest(self, pass_dict):
+        """SHA-256 over pass.json, the images and the certificate of a pass."""
+        return hashlib.sha256(self.fingerprint + self.serialize(pass_dict)).hexdigest()
+
+    def build(self, pass_dict):
+        """Return the archive entries of a pass as a ``{name: bytes}`` dict."""
+        pass_json = self.serialize(pass_dict)
+        manifest_dict = {"pass.json": hashlib.sha1(pass_json).hexdigest()}
+        for name, (_, sha1) in self.assets.items():
+            manifest_dict[name] = sha1
+        manifest = json.dumps(manifest_dict, indent=4).encode('utf-8')
+
+        entries = {
+            "signature": self.signer.sign(manifest),
+            "pass.json": pass_json,
+            "manifest.json": manifest,
+        }
+        for name, (data, _) in self.assets.items():
+            entries[name] = data
+        return entries
+
+    def write(self, pass_dict, target):
+        """Build, sign and write one pass to target (atomically)."""
+        target = Path(target)
+        tmp = target.with_name(f".{target.name}.tmp")
+        try:
+            with ZipFile(tmp, "w") as zip_file:
+                for name, data in self.build(pass_dict).items():
+                    entry = ZipInfo(name, ENTRY_DATE_TIME)
+                    entry.external_attr = 0o644 << 16
+                    zip_file.writestr(entry, data)
+            os.replace(tmp, target)
+        except BaseException:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+        return target
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Precompressed Output
+
+Writes ``.gz`` (and ``.br`` when the ``brotli`` package is installed)
+siblings at maximum compression next to every text-like file of the
+generated site, so a host or CDN can serve them as-is instead of
+compressing on the fly.
+
+Files whose compressed siblings are already newer than the file itself are
+skipped, and siblings whose original no longer exists are removed.
+
+Requirements:
+    - brotli (optional; only gzip sidecars are written without it)
+"""
+
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, see brotli_available()
+    brotli = None
+
+
+DEFAULT_EXTENSIONS = ('.html', '.css', '.js', '.json', '.vcf', '.svg', '.txt', '.ttf', '.otf')
+SIDECAR_SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+
+
+def brotli_available():
+    """Return True if the brotli package can be imported."""
+    return brotli is not None
+
+
+def _compress(data, fmt):
+    """Compress bytes with the strongest settings of a format."""
+    if fmt == 'gzip':
+        # mtime=0 keeps the output reproducible between builds
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def compress_file(path, formats):
+    """Write the compressed siblings of one file.
+
+    Returns ``(extension, original_size, {format: compressed_size}, skipped)``.
+    Sizes of up-to-date siblings are reported from disk.
+    """
+    path = Path(path)
+    source_stat = path.stat()
+    sizes = {}
+    skipped = True
+    data = None
+
+    for fmt in formats:
+        sidecar = path.with_name(path.name + SIDECAR_SUFFIXES[fmt])
+        try:
+            sidecar_stat = sidecar.stat()
+            if sidecar_stat.st_mtime_ns >= source_stat.st_mtime_ns:
+                sizes[fmt] = sidecar_stat.st_size
+                continue
+        except FileNotFoundError:
+            pass
+
+        if data is None:
+            data = path.read_bytes()
+        compressed = _compress(data, fmt)
+        tmp = sidecar.with_name(f".{sidecar.name}.tmp")
+        tmp.write_bytes(compressed)
+        os.replace(tmp, sidecar)
+        sizes[fmt] = len(compressed)
+        skipped = False
+
+    return path.suffix.lower(), source_stat.st_size, sizes, skipped
+
+
+def _compress_task(args):
+    """Pool entry point for compress_file."""
+    return compress_file(*args)
+
+
+def _iter_files(output_dir, extensions):
+    """Yield compressible files and remove orphaned sidecars."""
+    sidecar_suffixes = tuple(SIDECAR_SUFFIXES.values())
+    for root, dirs, files in os.walk(output_dir):
+        for name in files:
+            path = Path(root) / name
+            if name.endswith(sidecar_suffixes):
+                original = path.with_name(name[:-len(path.suffix)])
+                if not original.exists():
+                    path.unlink()
+            elif path.suffix.lower() in extensions:
+                yield path
+
+
+def precompress_tree(output_dir, formats=('gzip', 'brotli'), extensions=DEFAULT_EXTENSIONS, jobs=1):
+    """Write compressed siblings for every text-like file under output_dir.
+
+    Unavailable formats (brotli without the package) are dropped. Work is
+    spread over ``jobs`` processes when above 1.
+
+    Returns a report mapping each file extension to a dict with ``files``,
+    ``compressed`` (files written this run), ``bytes`` and the compressed
+    byte total per format.
+    """
+    formats = [fmt for fmt in formats if fmt != 'brotli' or brotli_available()]
+    tasks = [(str(path), formats) for path in _iter_files(output_dir, tuple(extensions))]
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_compress_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    else:
+        results = [_compress_task(task) for task in tasks]
+
+    report = {}
+    for extension, size, sizes, skipped in results:
+        entry = report.setdefault(extension, dict({'files': 0, 'compressed': 0, 'bytes': 0},
+                                                  **{fmt: 0 for fmt in formats}))
+        entry['files'] += 1
+        entry['compressed'] += 0 if skipped else 1
+        entry['bytes'] += size
+        for fmt, compressed_size in sizes.items():
+            entry[fmt] += compressed_size
+    return report
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+QR Payload Optimizer
+
+Wallet draws a pass's QR code itself, encoding ``barcode.message`` in
+byte mode, so the QR version (its size in modules) follows from the
+payload's length and the error correction level alone. Smaller versions
+have larger modules and scan faster and more reliably in poor light.
+
+``choose_payload`` measures candidate payloads in order of preference
+(e.g. the full vCard, the vCard without the redundant FN line, the URL of
+the card page) and returns the first whose QR version stays within a
+limit. Measurements are cached per payload, so a payload shared by many
+passes, or measured again in a later stage, is only encoded once.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+ERROR_CORRECTION_LEVELS = ('L', 'M', 'Q', 'H')
+
+# Data codewords per QR version (1-40) and error correction level (L, M, Q, H)
+DATA_CODEWORDS = (
+    (19, 16, 13, 9), (34, 28, 22, 16), (55, 44, 34, 26), (80, 64, 48, 36),
+    (108, 86, 62, 46), (136, 108, 76, 60), (156, 124, 88, 66), (194, 154, 110, 86),
+    (232, 182, 132, 100), (274, 216, 154, 122), (324, 254, 180, 140), (370, 290, 206, 158),
+    (428, 334, 244, 180), (461, 365, 261, 197), (523, 415, 295, 223), (589, 453, 325, 253),
+    (647, 507, 367, 283), (721, 563, 397, 313), (795, 627, 445, 341), (861, 669, 485, 385),
+    (932, 714, 512, 406), (1006, 782, 568, 442), (1094, 860, 614, 464), (1174, 914, 664, 514),
+    (1276, 1000, 718, 538), (1370, 1062, 754, 596), (1468, 1128, 808, 628), (1531, 1193, 871, 661),
+    (1631, 1267, 911, 701), (1735, 1373, 985, 745), (1843, 1455, 1033, 793), (1955, 1541, 1115, 845),
+    (2071, 1631, 1171, 901), (2191, 1725, 1231, 961), (2306, 1812, 1286, 986), (2434, 1914, 1354, 1054),
+    (2566, 1992, 1426, 1096), (2702, 2102, 1502, 1142), (2812, 2216, 1582, 1222), (2956, 2334, 1666, 1276),
+)
+
+QRMeasurement = namedtuple('QRMeasurement', ['kind', 'bytes', 'version', 'modules', 'error_correction'])
+QRMeasurement.__doc__ = """Size of one payload's QR code.
+
+``version`` is None when the payload does not fit a QR code at all;
+``modules`` is the width of the code in modules (21 for version 1).
+"""
+
+
+def byte_capacity(version, error_correction):
+    """Bytes a QR code of a version and level holds in byte mode."""
+    data_bits = DATA_CODEWORDS[version - 1][ERROR_CORRECTION_LEVELS.index(error_correction)] * 8
+    # 4-bit mode indicator plus an 8-bit (versions 1-9) or 16-bit length
+    return (data_bits - 4 - (8 if version < 10 else 16)) // 8
+
+
+@lru_cache(maxsize=4096)
+def measure(payload, error_correction='M', encoding='utf-8'):
+    """Return ``(bytes, version)`` of a payload; version is None if it does not fit."""
+    size = len(payload.encode(encoding))
+    for version in range(1, 41):
+        if size <= byte_capacity(version, error_correction):
+            return size, version
+    return size, None
+
+
+def choose_payload(candidates, max_version, error_correction='M', encoding='utf-8'):
+    """Pick the first ``(kind, payload)`` candidate whose QR version is at most max_version.
+
+    Candidates are tried in order of preference; when none fits, the
+    smallest one is used. Returns ``(payload, QRMeasurement)``.
+    """
+    if error_correction not in ERROR_CORRECTION_LEVELS:
+        raise ValueError(f"Unknown QR error correction level: {error_correction} "
+                         f"(expected one of {', '.join(ERROR_CORRECTION_LEVELS)})")
+    best = None
+    for kind, payload in candidates:
+        size, version = measure(payload, error_correction, encoding)
+        measurement = QRMeasurement(kind, size, version, 17 + 4 * version if version else None,
+                                    error_correction)
+        if version is not None and version <= max_version:
+            return payload, measurement
+        if best is None or size < best[1].bytes:
+            best = (payload, measurement)
+    return best
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+vCard Serializer
+
+The one vCard writer shared by the site generator (per-member ``.vcf``
+files and bulk exports) and the Apple Wallet builder (QR code payloads).
+
+Output follows RFC 2426 (3.0) and RFC 6350 (4.0):
+
+- lines end with CRLF and are folded at 75 octets, continuation lines
+  starting with a space; folds never split a UTF-8 sequence
+- text values escape backslash, comma, semicolon and newlines, structured
+  values (N, ORG) escape each component; URI values are written as they
+  are
+- 4.0 writes telephone numbers as ``tel:`` URIs and photos as plain URIs
+
+``serialize_many`` renders any number of contacts into one list of lines
+joined once, which is the fast path for batches. ``formatted_name=False``
+leaves out the FN line, which repeats N, for payloads where every byte
+counts (wallet QR codes); most readers derive the display name from N.
+"""
+
+import re
+from collections import namedtuple
+
+# Bump when the output changes so incremental builds rewrite every .vcf
+SERIALIZER_VERSION = "1"
+
+VERSIONS = ('3.0', '4.0')
+
+# Longest line in octets, CRLF excluded (RFC 6350 section 3.2)
+MAX_LINE_OCTETS = 75
+
+VCardContact = namedtuple('VCardContact', [
+    'first_name', 'last_name', 'title', 'organization', 'phone', 'email',
+    'urls', 'photo_url', 'phone_types',
+], defaults=('', '', '', (), '', ('WORK', 'VOICE')))
+VCardContact.__doc__ = """Fields of one contact card.
+
+``phone`` should already be reduced to digits and ``+``. ``urls`` is a
+sequence of ``(type, url)`` pairs; an empty type writes a plain ``URL``.
+"""
+
+_NEEDS_ESCAPE = re.compile(r'[\\,;\r\n]')
+_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', ',': '\\,', ';': '\\;', '\n': '\\n', '\r': ''})
+_LINE_BREAKS = re.compile(r'[\r\n]+')
+
+
+def escape_text(value):
+    """Escape a text value (or one component of a structured value)."""
+    value = value.strip()
+    if _NEEDS_ESCAPE.search(value):
+        return value.translate(_TEXT_ESCAPES)
+    return value
+
+
+def _uri(value):
+    """URI values are not escaped, but must not break the line."""
+    value = value.strip()
+    if '\n' in value or '\r' in value:
+        return _LINE_BREAKS.sub('', value)
+    return value
+
+
+def fold_line(line):
+    """Fold a content line at 75 octets without splitting UTF-8 sequences."""
+    if line.isascii():
+        if len(line) <= MAX_LINE_OCTETS:
+            return line
+        # Continuation lines start with a space, leaving 74 octets of content
+        parts = [line[:MAX_LINE_OCTETS]]
+        parts.extend(line[i:i + MAX_LINE_OCTETS - 1]
+                     for i in range(MAX_LINE_OCTETS, len(line), MAX_LINE_OCTETS - 1))
+        return '\r\n '.join(parts)
+
+    data = line.encode('utf-8')
+    if len(data) <= MAX_LINE_OCTETS:
+        return line
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        # Back off to the first byte of a multi-byte character
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+        limit = MAX_LINE_OCTETS - 1
+    parts.append(data[start:])
+    return b'\r\n '.join(parts).decode('utf-8')
+
+
+def _card_lines(contact, version, formatted_name=True):
+    """Return the unfolded content lines of one card."""
+    first_name = escape_text(contact.first_name)
+    last_name = escape_text(contact.last_name)
+    title = escape_text(contact.title)
+    organization = escape_text(contact.organization)
+    email = escape_text(contact.email)
+
+    lines = [
+        'BEGIN:VCARD',
+        'VERSION:4.0' if version == '4.0' else 'VERSION:3.0',
+    ]
+    if formatted_name:
+        lines.append(f'FN:{first_name} {last_name}')
+    lines.append(f'N:{last_name};{first_name};;;')
+    if title:
+        lines.append(f'TITLE:{title}')
+    if organization:
+        lines.append(f'ORG:{organization}')
+
+    if contact.phone:
+        phone = _uri(contact.phone)
+        if version == '4.0':
+            types = ','.join(contact.phone_types).lower()
+            lines.append(f'TEL;VALUE=uri;TYPE="{types}":tel:{phone}')
+        else:
+            lines.append(f'TEL;TYPE={",".join(contact.phone_types)}:{phone}')
+
+    if email:
+        lines.append(f'EMAIL;TYPE=work:{email}' if version == '4.0' else f'EMAIL;TYPE=WORK:{email}')
+
+    for url_type, url in contact.urls:
+        if url:
+            prefix = f'URL;TYPE={url_type}:' if url_type else 'URL:'
+            lines.append(prefix + _uri(url))
+
+    if contact.photo_url:
+        prefix = 'PHOTO:' if version == '4.0' else 'PHOTO;VALUE=URL:'
+        lines.append(prefix + _uri(contact.photo_url))
+
+    lines.append('END:VCARD')
+    return lines
+
+
+def serialize_many(contacts, version='3.0', formatted_name=True):
+    """Serialize an iterable of VCardContact records into one vCard stream."""
+    if version not in VERSIONS:
+        raise ValueError(f"Unsupported vCard version: {version} (expected one of {', '.join(VERSIONS)})")
+    lines = []
+    for contact in contacts:
+        for line in _card_lines(contact, version, formatted_name):
+            # Only long or non-ASCII lines can need folding
+            lines.append(line if len(line) <= 18 or (len(line) <= MAX_LINE_OCTETS and line.isascii())
+                         else fold_line(line))
+    if not lines:
+        return ''
+    lines.append('')
+    return '\r\n'.join(lines)
+
+
+def serialize(contact, version='3.0', formatted_name=True):
+    """Serialize one VCardContact."""
+    return serialize_many((contact,), version, formatted_name)
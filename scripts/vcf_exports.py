@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Bulk vCard Exports
+
+Combined ``.vcf`` files holding many contacts, so a whole team can be
+imported into a phone or CRM with one download:
+
+- ``team.vcf`` with every member, in roster order
+- optional splits by a member field, e.g. ``by-title/<title>.vcf`` or
+  ``by-company_name/<company>.vcf``
+
+Cards are appended to the open export files while the roster streams
+through the build, so no export is ever held in memory. Every file is
+written to a temporary name and only replaces the published one when its
+content changed, which keeps unchanged exports (and their mtimes) intact.
+Optional ``.gz`` variants are compressed from the finished files in a
+streaming pass as well.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+
+TEAM_EXPORT = 'team.vcf'
+
+# Split files kept open at once; the least recently used one is closed and
+# reopened for appending when needed
+MAX_OPEN_FILES = 64
+
+_NON_SLUG_CHARS = re.compile(r'[^a-z0-9\-]')
+_REPEATED_DASHES = re.compile(r'-+')
+
+
+def group_slug(value):
+    """File name stem for a split group, e.g. 'Head of Sales, EMEA' -> 'head-of-sales-emea'."""
+    slug = _REPEATED_DASHES.sub('-', _NON_SLUG_CHARS.sub('', value.lower().replace(' ', '-'))).strip('-')
+    if not slug:
+        # Names without any ASCII letter (e.g. CJK titles) get a stable hash
+        slug = 'group-' + hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]
+    return slug
+
+
+class GroupPaths:
+    """Assigns split groups their export paths, keeping distinct values apart.
+
+    Values whose slugs collide (e.g. 'Head of Sales, EMEA' and 'Head of
+    Sales EMEA') would otherwise share one file. The first value seen keeps
+    the plain slug; later ones get a short hash of the value appended.
+    """
+
+    def __init__(self):
+        self._paths = {}  # (field, value) -> relative path
+        self._taken = set()
+
+    def path(self, field, value):
+        """Return the relative export path of one group value."""
+        relative_path = self._paths.get((field, value))
+        if relative_path is None:
+            slug = group_slug(value)
+            relative_path = f"by-{field}/{slug}.vcf"
+            if relative_path in self._taken:
+                digest = hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]
+                relative_path = f"by-{field}/{slug}-{digest}.vcf"
+            self._taken.add(relative_path)
+            self._paths[(field, value)] = relative_path
+        return relative_path
+
+
+def export_paths(member, split_by=(), groups=None):
+    """Yield the ``(relative path, label)`` of every export a member belongs to.
+
+    The team export comes first, then one split group per non-empty field.
+    Pass the same ``groups`` (a GroupPaths) for every member of a roster so
+    colliding group slugs are told apart.
+    """
+    if groups is None:
+        groups = GroupPaths()
+    yield TEAM_EXPORT, 'Everyone'
+    for field in split_by:
+        value = (getattr(member, field, '') or '').strip()
+        if value:
+            yield groups.path(field, value), value
+
+
+def export_order(entry):
+    """Sort key of a published export: the team export first, then by field and label."""
+    return (entry['path'] != TEAM_EXPORT, entry['path'].split('/')[0], entry['label'].lower())
+
+
+def _file_digest(path):
+    """SHA-256 of a file read in blocks, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _gzip_writer(fileobj):
+    # No file name and mtime=0 in the header keep the output reproducible
+    return gzip.GzipFile(filename='', mode='wb', fileobj=fileobj, compresslevel=9, mtime=0)
+
+
+def gzip_bytes(data):
+    """Return data compressed exactly like gzip_file compresses a file."""
+    buffer = io.BytesIO()
+    with _gzip_writer(buffer) as dst:
+        dst.write(data)
+    return buffer.getvalue()
+
+
+def gzip_file(path, target):
+    """Stream path into a reproducible gzip file at target (atomically)."""
+    tmp = target.with_name(f".{target.name}.tmp")
+    with open(path, 'rb') as src, open(tmp, 'wb') as raw:
+        with _gzip_writer(raw) as dst:
+            shutil.copyfileobj(src, dst, 1 << 16)
+    os.replace(tmp, target)
+
+
+class VcfExports:
+    """Streams vCards into the combined and split export files."""
+
+    def __init__(self, output_dir, split_by=(), gzip_variants=False):
+        self.output_dir = Path(output_dir)
+        self.split_by = tuple(split_by)
+        self.gzip_variants = gzip_variants
+        self._groups = GroupPaths()
+        self._exports = OrderedDict()  # relative path -> export state
+        self._open = OrderedDict()  # relative path -> open file (LRU order)
+
+    def add(self, member, vcard):
+        """Append one member's vCard to the team export and its split groups."""
+        if not vcard.endswith('\n'):
+            vcard += '\n'
+        data = vcard.encode('utf-8')
+
+        for relative_path, label in export_paths(member, self.split_by, self._groups):
+            self._write(relative_path, label, data)
+
+    def _write(self, relative_path, label, data):
+        export = self._exports.get(relative_path)
+        if export is None:
+            target = self.output_dir / relative_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            export = self._exports[relative_path] = {
+                'label': label,
+                'target': target,
+                'tmp': target.with_name(f".{target.name}.tmp"),
+                'digest': hashlib.sha256(),
+                'count': 0,
+            }
+            mode = 'wb'
+        else:
+            mode = 'ab'
+
+        handle = self._open.get(relative_path)
+        if handle is None:
+            handle = self._open[relative_path] = open(export['tmp'], mode)
+            if len(self._open) > MAX_OPEN_FILES:
+                _, oldest = self._open.popitem(last=False)
+                oldest.close()
+        else:
+            self._open.move_to_end(relative_path)
+
+        handle.write(data)
+        export['digest'].update(data)
+        export['count'] += 1
+
+    def close(self):
+        """Publish the finished exports and remove ones no longer produced.
+
+        Returns a list of dicts (``path``, ``label``, ``count``, ``gzip_path``
+        and ``updated``), the team export first and then the splits by field
+        and label.
+        """
+        for handle in self._open.values():
+            handle.close()
+        self._open.clear()
+
+        published = []
+        keep = set()
+        for relative_path, export in self._exports.items():
+            target = export['target']
+            updated = _file_digest(target) != export['digest'].hexdigest()
+            if updated:
+                os.replace(export['tmp'], target)
+            else:
+                os.remove(export['tmp'])
+            keep.add(relative_path)
+
+            gzip_path = None
+            if self.gzip_variants:
+                gzip_path = f"{relative_path}.gz"
+                gzip_target = self.output_dir / gzip_path
+                if updated or not gzip_target.exists():
+                    gzip_file(target, gzip_target)
+                keep.add(gzip_path)
+
+            published.append({
+                'path': relative_path,
+                'label': export['label'],
+                'count': export['count'],
+                'gzip_path': gzip_path,
+                'updated': updated,
+            })
+
+        self._remove_stale(keep)
+        published.sort(key=export_order)
+        return published
+
+    def _remove_stale(self, keep):
+        """Delete files (and emptied directories) that were not produced."""
+        if not self.output_dir.exists():
+            return
+        for root, dirs, files in os.walk(self.output_dir, topdown=False):
+            for name in files:
+                path = Path(root) / name
+                relative_path = path.relative_to(self.output_dir).as_posix()
+                # Precompressed siblings (.gz/.br) of kept files stay too
+                base_path = relative_path.rsplit('.', 1)[0]
+                if relative_path not in keep and base_path not in keep:
+                    path.unlink()
+            if Path(root) != self.output_dir and not os.listdir(root):
+                os.rmdir(root)
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Apple Wallet Passes
+
+Builds one signed ``.pkpass`` business card per team member from the
+site generator's validated ``PreparedMember`` records, in the calling
+process. No second interpreter is started, the roster is not re-read, and
+the working directory is never changed.
+
+Settings come from the ``wallet`` section of config.json (see
+``DEFAULT_SETTINGS``); relative paths are resolved against the project
+directory. The certificate password can also be set in the
+``WALLET_CERTIFICATE_PASSWORD`` environment variable.
+
+With ``web_service_url`` set, passes carry the URL of the PassKit web
+service (scripts/pass_web_service.py) and a per-pass authentication
+token, an HMAC of the serial number under ``web_service_secret`` (or the
+``WALLET_WEB_SERVICE_SECRET`` environment variable). Devices then fetch
+only the passes that changed.
+
+The QR code carries the member's vCard. When that would need a QR version
+above ``qr_max_version`` (at ``qr_error_correction``), the FN line is left
+out, and if that is still too large the code carries the card page URL
+(``qr_fallback_url``) instead. Every result reports the chosen payload
+and its QR version.
+
+Members are added while the roster streams through a build. Each member's
+pass dict is created and digested right away (``PassBuilder.digest``), and
+only passes whose digest differs from the last run are built and signed,
+in bounded batches, serially or on a worker pool. ``close()`` builds the
+last batch, deletes the passes of members who left the roster, saves the
+digests and returns a report.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pass_signing import PassSigner, cryptography_available
+from pkpass import PASS_ASSETS, PassBuilder
+from qr_payload import ERROR_CORRECTION_LEVELS, choose_payload
+from vcard import VCardContact, serialize as serialize_vcard
+
+DEFAULT_SETTINGS = {
+    'pass_type_identifier': "pass.com.scalewave.contacts.team",
+    'team_identifier': "VVA864P233",
+    'organization_name': "Scalewave",
+    'certificate': "certs/YourPassTypeID.p12",
+    'certificate_password': "samerroz1",
+    'wwdr_certificate': "certs/WWDR.pem",
+    'assets_dir': "assets/images",
+    'manifest': ".build/passes.json",
+    'web_service_url': "",
+    'web_service_secret': "",
+    'web_service_store': ".build/pass-registrations.sqlite3",
+    # Largest QR version for the vCard payload (61x61 modules); Wallet encodes
+    # byte mode, the level is the one assumed for measuring
+    'qr_max_version': 11,
+    'qr_error_correction': "M",
+    'qr_fallback_url': "{site_url}/html/{filename}.html",
+}
+
+PASSWORD_ENVIRONMENT_VARIABLE = "WALLET_CERTIFICATE_PASSWORD"
+SECRET_ENVIRONMENT_VARIABLE = "WALLET_WEB_SERVICE_SECRET"
+
+PASS_MANIFEST_VERSION = 2
+
+# Changed passes handed to the signing worker pool per batch, per worker
+PASS_BATCH_PER_WORKER = 64
+
+# Brand Colors (Scalewave Color Palette)
+COLORS = {
+    "background": "rgb(255, 255, 255)",      # Pure white background (was greenish)
+    "primary_text": "rgb(31, 75, 140)",     # #1f4b8c FORMALIDAD - dark blue
+    "accent": "rgb(11, 33, 255)",           # #0b21ff INNOVACIÓN - bright blue
+    "labels": "rgb(31, 75, 140)",           # #1f4b8c FORMALIDAD - same as primary for labels
+}
+
+
+def wallet_settings(config):
+    """Return the wallet settings of a config dict, with defaults filled in."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get('wallet', {}))
+    settings.setdefault('site_url', config['deployment']['base_url'])
+    password = os.environ.get(PASSWORD_ENVIRONMENT_VARIABLE)
+    if password is not None:
+        settings['certificate_password'] = password
+    secret = os.environ.get(SECRET_ENVIRONMENT_VARIABLE)
+    if secret is not None:
+        settings['web_service_secret'] = secret
+    if settings['qr_error_correction'] not in ERROR_CORRECTION_LEVELS:
+        raise ValueError(f"wallet.qr_error_correction must be one of {', '.join(ERROR_CORRECTION_LEVELS)}")
+    if not 1 <= settings['qr_max_version'] <= 40:
+        raise ValueError("wallet.qr_max_version must be between 1 and 40")
+    if settings['web_service_url'] and len(settings['web_service_secret']) < 16:
+        raise ValueError(f"wallet.web_service_url needs a web service secret of at least 16 "
+                         f"characters (set {SECRET_ENVIRONMENT_VARIABLE})")
+    return settings
+
+
+def authentication_token(serial, settings):
+    """Token a device sends back to the web service for one pass."""
+    message = f"{settings['pass_type_identifier']}/{serial}".encode('utf-8')
+    return hmac.new(settings['web_service_secret'].encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def check_requirements(base_dir, settings):
+    """Check that cryptography is installed and the certificates and pass images exist."""
+    base_dir = Path(base_dir)
+    assets_dir = base_dir / settings['assets_dir']
+    return {
+        'cryptography': cryptography_available(),
+        'certificates': ((base_dir / settings['certificate']).exists() and
+                         (base_dir / settings['wwdr_certificate']).exists()),
+        'assets': assets_dir.exists() and all((assets_dir / asset).exists() for asset in PASS_ASSETS),
+    }
+
+
+def pass_filename(member):
+    """File name stem of a member's pass, e.g. 'jose-antonio-garcia'."""
+    return member.full_name.lower().replace(' ', '-').replace('.', '').replace(',', '')
+
+
+def pass_serial(member, settings):
+    """Stable serial number of a member's pass, derived from their name.
+
+    The same member keeps the same serial across runs, so a rebuilt pass
+    replaces the one already in Wallet instead of being added next to it.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL,
+                          f"{settings['pass_type_identifier']}/{pass_filename(member)}"))
+
+
+def build_vcard(member, settings, formatted_name=True):
+    """Build a vCard string to embed directly in the QR code.
+
+    Encoding the contact details in the barcode instead of a URL means scanning
+    the pass drops the contact straight into the phone, with no network needed.
+    Uses the same serializer as the site's .vcf files.
+    """
+    contact = VCardContact(
+        first_name=member.first_name,
+        last_name=member.last_name,
+        title=member.title,
+        organization=settings['organization_name'],
+        phone=member.phone_clean,
+        email=member.email,
+        urls=[('', member.linkedin_url)] if member.linkedin_url else [],
+        phone_types=('CELL',),
+    )
+    return serialize_vcard(contact, '3.0', formatted_name)
+
+
+def qr_payload(member, settings):
+    """Return the QR message of a member's pass and its QRMeasurement.
+
+    Prefers the full vCard, then the vCard without FN, then the card URL,
+    whichever first fits ``qr_max_version``.
+    """
+    fallback_url = settings['qr_fallback_url'].format(
+        site_url=settings['site_url'].rstrip('/'), filename=member.filename)
+    candidates = (
+        ('vcard', build_vcard(member, settings)),
+        ('vcard-without-fn', build_vcard(member, settings, formatted_name=False)),
+        ('url', fallback_url),
+    )
+    return choose_payload(candidates, settings['qr_max_version'], settings['qr_error_correction'])
+
+
+def create_pass_dict(member, settings, barcode_message=None):
+    """Create pass dictionary following TranzerCode structure exactly with Scalewave branding.
+
+    ``barcode_message`` defaults to the payload chosen by ``qr_payload``.
+    """
+    organization_name = settings['organization_name']
+    card_url = f"{settings['site_url'].rstrip('/')}/html/{member.filename}.html"
+    serial = pass_serial(member, settings)
+    if barcode_message is None:
+        barcode_message, _ = qr_payload(member, settings)
+
+    # EXACT TranzerCode structure - DO NOT CHANGE
+    pass_dict = {
+        "formatVersion": 1,
+        "serialNumber": serial,
+        "passTypeIdentifier": settings['pass_type_identifier'],
+        "teamIdentifier": settings['team_identifier'],
+        "organizationName": organization_name,
+        "description": f"{organization_name} Contact Card",
+        "logoText": "",  # Empty top right as requested
+
+        # Scalewave Brand Colors (Updated)
+        "foregroundColor": COLORS["primary_text"],      # Dark blue text
+        "backgroundColor": COLORS["background"],        # Pure white background
+        "labelColor": COLORS["labels"],                 # Dark blue labels
+
+        # QR Code carrying the contact details themselves, so scanning saves the
+        # contact directly instead of depending on the site being reachable.
+        "barcode": {
+            "message": barcode_message,
+            "format": "PKBarcodeFormatQR",
+            "messageEncoding": "utf-8",
+            "altText": "Scan to save contact"  # This text is rendered near the barcode
+        },
+
+        # Final Layout: "CONTACT CARD" as a title, side-by-side secondary fields
+        "generic": {
+            "primaryFields": [
+                {
+                    "key": "member",
+                    "label": "CONTACT CARD",  # Added label to the name field
+                    "value": member.full_name,
+                    "textAlignment": "PKTextAlignmentLeft"
+                }
+            ],
+            "secondaryFields": [
+                {
+                    "key": "title",
+                    "label": "TITLE",
+                    "value": member.title,
+                    "textAlignment": "PKTextAlignmentLeft"
+                },
+                {
+                    "key": "contact_info",
+                    "label": "CONTACT INFORMATION",
+                    "value": "Scan QR Code",
+                    "textAlignment": "PKTextAlignmentRight"
+                }
+            ],
+            # NO auxiliaryFields or headerFields to ensure no right-side icon.
+            # Back fields with essential contact info
+            "backFields": [
+                {"label": "Full Contact Info", "key": "website", "value": card_url},
+                {"label": "Email", "key": "email", "value": member.email or "N/A"},
+                {"label": "Phone", "key": "phone", "value": member.phone or "N/A"},
+                {"label": "Company", "key": "company", "value": organization_name}
+            ]
+        }
+    }
+
+    # Updates through the PassKit web service, when one is configured
+    if settings['web_service_url']:
+        pass_dict["webServiceURL"] = settings['web_service_url']
+        pass_dict["authenticationToken"] = authentication_token(serial, settings)
+    return pass_dict
+
+
+def load_pass_builder(certificate_path, certificate_password, wwdr_path, assets_dir):
+    """Load the signing certificate and the pass images."""
+    return PassBuilder(assets_dir, PassSigner(certificate_path, certificate_password, wwdr_path))
+
+
+def load_pass_manifest(path):
+    """Load the pass entries of the previous run (empty if missing or outdated).
+
+    Entries map pass file names to ``digest``, ``serial`` and ``updated``
+    (when the pass file last changed, in milliseconds since the epoch).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != PASS_MANIFEST_VERSION:
+        return {}
+    return data.get('passes', {})
+
+
+def save_pass_manifest(manifest, path):
+    """Write the pass entries (atomically)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': PASS_MANIFEST_VERSION, 'passes': manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class WalletPasses:
+    """Builds the passes of the members added, skipping unchanged ones.
+
+    Changed passes are built in bounded batches while members are still
+    being added, serially or (with ``jobs`` above 1) on a worker pool where
+    every worker loads its own PassBuilder once and builds purely in memory.
+    Only the manifest entry and QR measurement of each member are kept
+    between batches.
+
+    Loading the certificate raises ``ValueError`` (e.g. wrong password) or
+    ``OSError``.
+    """
+
+    def __init__(self, base_dir, output_dir, settings, force=False, jobs=1):
+        base_dir = Path(base_dir)
+        self.settings = settings
+        self.jobs = jobs
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.signing = (
+            base_dir / settings['certificate'],
+            settings['certificate_password'],
+            base_dir / settings['wwdr_certificate'],
+            base_dir / settings['assets_dir'],
+        )
+        self.builder = load_pass_builder(*self.signing)
+        self.manifest_file = base_dir / settings['manifest']
+        self.previous = {} if force else load_pass_manifest(self.manifest_file)
+        self._batch_size = max(1, jobs) * PASS_BATCH_PER_WORKER
+        self._executor = None
+        self._reset()
+
+    def _reset(self):
+        self._manifest = {}  # pass file name -> manifest entry
+        self._qr = []  # name, serial and QR measurement of every pass
+        self._failed = []
+        self._pending = []  # (result, pass dict) of the current batch
+        self._built = 0
+        self._skipped = 0
+        self._seconds = 0.0
+
+    @property
+    def missing_assets(self):
+        """Pass images not found in the assets directory."""
+        return self.builder.missing_assets
+
+    def add(self, member):
+        """Create and digest the pass of one member; build it later if it changed."""
+        filename = pass_filename(member)
+        path = self.output_dir / f"{filename}.pkpass"
+        result = {
+            'name': member.full_name,
+            'filename': filename,
+            'path': str(path),
+            'serial': None,
+            'digest': None,
+            'qr': None,
+            'skipped': False,
+            'error': None,
+        }
+        try:
+            barcode_message, qr = qr_payload(member, self.settings)
+            result['qr'] = qr._asdict()
+            pass_dict = create_pass_dict(member, self.settings, barcode_message)
+            result['serial'] = pass_dict['serialNumber']
+            result['digest'] = self.builder.digest(pass_dict)
+        except Exception as e:
+            result['error'] = str(e)
+            self._finish(result)
+            return
+        self._qr.append(dict(name=result['name'], serial=result['serial'], **result['qr']))
+        previous = self.previous.get(filename, {})
+        if previous.get('digest') == result['digest'] and path.exists():
+            result['skipped'] = True
+            self._finish(result, previous.get('updated'))
+            return
+        self._pending.append((result, pass_dict))
+        if len(self._pending) >= self._batch_size:
+            self._build_pending()
+
+    def _build_pending(self):
+        """Build and sign the passes of the current batch."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        start = time.perf_counter()
+        if self.jobs <= 1 or len(pending) < 2:
+            errors = [_write_pass(self.builder, pass_dict, result['path']) for result, pass_dict in pending]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.jobs,
+                                                     initializer=_init_pass_worker,
+                                                     initargs=self.signing)
+            errors = list(self._executor.map(
+                _write_pass_in_worker,
+                [pass_dict for _, pass_dict in pending],
+                [result['path'] for result, _ in pending],
+                chunksize=max(1, len(pending) // (self.jobs * 4))
+            ))
+        self._seconds += time.perf_counter() - start
+        updated = int(time.time() * 1000)
+        for (result, _), error in zip(pending, errors):
+            result['error'] = error
+            self._finish(result, updated)
+
+    def _finish(self, result, updated=None):
+        """Record a built, skipped or failed pass for the manifest and report."""
+        filename = result['filename']
+        if result['error']:
+            self._failed.append(result)
+            # Passes that failed this time keep their previous file and entry
+            if filename in self.previous:
+                self._manifest[filename] = self.previous[filename]
+            return
+        self._manifest[filename] = {
+            'digest': result['digest'],
+            'serial': result['serial'],
+            'updated': updated,
+        }
+        if result['skipped']:
+            self._skipped += 1
+        else:
+            self._built += 1
+
+    def close(self):
+        """Build the last batch, prune removed passes and save the digests.
+
+        Errors are captured per pass instead of raised.
+
+        Returns a dict with the ``built``/``skipped`` counts, the ``failed``
+        results (``name``, ``filename``, ``path``, ``serial``, ``digest``,
+        ``qr``, ``skipped`` and ``error``), the ``removed`` pass file names,
+        ``qr`` (``name``, ``serial``, payload kind, bytes, QR version,
+        modules and error correction level of every pass, in roster order),
+        the number of passes per QR version in ``qr_versions`` and the build
+        time in ``seconds``.
+        """
+        try:
+            self._build_pending()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        manifest = self._manifest
+        save_pass_manifest(manifest, self.manifest_file)
+
+        current = set(manifest) | {result['filename'] for result in self._failed}
+        removed = []
+        for path in sorted(self.output_dir.glob("*.pkpass")):
+            if path.stem not in current:
+                path.unlink()
+                removed.append(path.name)
+
+        qr_versions = {}
+        for entry in self._qr:
+            qr_versions[entry['version']] = qr_versions.get(entry['version'], 0) + 1
+        report = {
+            'built': self._built,
+            'skipped': self._skipped,
+            'failed': self._failed,
+            'removed': removed,
+            'qr': self._qr,
+            'qr_versions': dict(sorted(qr_versions.items(), key=lambda item: item[0] or 99)),
+            'seconds': self._seconds,
+        }
+        self._reset()
+        return report
+
+
+def _write_pass(builder, pass_dict, path):
+    """Build, sign and write one pass; returns the error message, if any."""
+    try:
+        builder.write(pass_dict, path)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+_worker_builder = None
+
+
+def _init_pass_worker(*signing):
+    """Load the certificate and pass images of a worker process once at startup."""
+    global _worker_builder
+    _worker_builder = load_pass_builder(*signing)
+
+
+def _write_pass_in_worker(pass_dict, path):
+    """Build one pass with the worker's builder."""
+    return _write_pass(_worker_builder, pass_dict, path)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Watch Mode and Local Preview
+
+Building blocks of ``generate_site.py --watch``: change detection for the
+site inputs and a small HTTP server that previews the output directory and
+reloads open pages after every rebuild.
+
+Changes are detected by polling ``os.stat`` of the watched files, which is
+a few hundred stat calls per interval for this project, needs no extra
+package, and also catches editors that save by writing a new file and
+renaming it over the old one.
+
+The preview server rewrites the deployment base URL in the HTML, CSS, JS
+and JSON it serves to the local server, so pages load the local assets
+instead of the deployed ones, and injects a script into every HTML page
+that listens to a server-sent events stream and reloads when a build
+finishes. Nothing is changed on disk.
+"""
+
+import http.server
+import os
+import threading
+import time
+from functools import partial
+
+RELOAD_PATH = '/__reload'
+RELOAD_SNIPPET = (
+    "<script>new EventSource('" + RELOAD_PATH + "')"
+    ".onmessage = function () { location.reload(); };</script>"
+)
+REWRITTEN_EXTENSIONS = ('.html', '.css', '.js', '.json')
+
+# Seconds between keep-alive comments on idle reload streams
+KEEPALIVE_SECONDS = 15
+
+
+def snapshot(paths):
+    """Map every file under the given files and directories to (mtime, size)."""
+    state = {}
+    for path in paths:
+        path = str(path)
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for name in files:
+                    file_path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(file_path)
+                    except FileNotFoundError:
+                        continue
+                    state[file_path] = (stat.st_mtime_ns, stat.st_size)
+        else:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(before, after):
+    """Return the paths added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def iter_changes(paths, interval=0.25, settle=0.05):
+    """Yield the set of changed files every time the watched paths change.
+
+    ``paths`` is a callable returning the files and directories to watch,
+    so the watched set can follow config changes. After a change is seen
+    the paths are polled once more ``settle`` seconds later, so a save
+    that touches several files is reported as one change.
+    """
+    before = snapshot(paths())
+    while True:
+        time.sleep(interval)
+        after = snapshot(paths())
+        if after == before:
+            continue
+        time.sleep(settle)
+        after = snapshot(paths())
+        changed = changed_paths(before, after)
+        before = after
+        if changed:
+            yield changed
+
+
+class BuildNotifier:
+    """Counts finished builds and wakes up the reload streams."""
+
+    def __init__(self):
+        self.build = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        """Record a finished build."""
+        with self._condition:
+            self.build += 1
+            self._condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """Wait until a build newer than ``seen`` finished; returns the latest."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.build != seen, timeout)
+            return self.build
+
+
+class PreviewRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the output directory with live reload and local asset URLs."""
+
+    def __init__(self, *args, base_url='', notifier=None, **kwargs):
+        self.base_url = base_url.rstrip('/')
+        self.notifier = notifier
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        # Keep the console for build output
+        pass
+
+    def end_headers(self):
+        # The preview must always show the latest build
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        url_path = self.path.split('?', 1)[0].split('#', 1)[0]
+        if url_path == RELOAD_PATH:
+            self.stream_reloads()
+            return
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and url_path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if path.endswith(REWRITTEN_EXTENSIONS) and os.path.isfile(path):
+            self.send_rewritten(path)
+            return
+        super().do_GET()
+
+    def send_rewritten(self, path):
+        """Send a text file with local URLs (and the reload script for HTML)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if self.base_url:
+            text = text.replace(self.base_url + '/', '/')
+        if path.endswith('.html'):
+            position = text.rfind('</body>')
+            if position == -1:
+                text += RELOAD_SNIPPET
+            else:
+                text = text[:position] + RELOAD_SNIPPET + text[position:]
+
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        """Server-sent events stream sending ``reload`` after every build."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        seen = self.notifier.build
+        try:
+            while True:
+                latest = self.notifier.wait(seen, KEEPALIVE_SECONDS)
+                if latest != seen:
+                    seen = latest
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_preview_server(directory, base_url, notifier, host='127.0.0.1', port=8000):
+    """Serve ``directory`` on a background thread; returns the server."""
+    handler = partial(PreviewRequestHandler, directory=str(directory),
+                      base_url=base_url, notifier=notifier)
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server